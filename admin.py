@@ -0,0 +1,35 @@
+from packages import st, os
+import metrics
+import warmup
+
+# ----------------------------
+# Admin metrics panel (sidebar)
+# ----------------------------
+# Hidden unless FOOTDLE_ADMIN_TOKEN is set and the page is opened with
+# ?admin=<token>.
+ADMIN_TOKEN = os.environ.get("FOOTDLE_ADMIN_TOKEN")
+
+def admin_enabled():
+    return bool(ADMIN_TOKEN) and st.query_params.get("admin") == ADMIN_TOKEN
+
+def show_admin_panel():
+    from packages import pd
+    from snapshot import DATA_DIR
+    export_path = metrics.METRICS_FILE or os.path.join(DATA_DIR, "metrics.prom")
+    with st.expander("📈 Metrics", expanded=False):
+        timers, counters = metrics.summary()
+        st.markdown("**Timers**")
+        if timers:
+            st.dataframe(pd.DataFrame(timers).round(2), hide_index=True)
+        st.markdown("**Counters**")
+        if counters:
+            st.dataframe(pd.DataFrame(counters), hide_index=True)
+        warm = warmup.progress()
+        st.markdown(f"**Warm-up:** {warm['stage']} ({warm['done']}/{warm['total']} photos)" + (f" — {warm['error']}" if warm["error"] else ""))
+        st.download_button("Download (Prometheus)", metrics.prometheus_text(), file_name="footdle.prom", mime="text/plain")
+        if st.button("Write to file"):
+            metrics.write_metrics(export_path)
+            st.caption(f"Written to {export_path}")
+        if st.button("Reset"):
+            metrics.reset()
+            st.rerun()
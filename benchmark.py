@@ -0,0 +1,189 @@
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import fetch
+import images
+from packages import os
+from fixtures import FixtureServer, PLAYERS_PER_PAGE, wikipedia_index
+from images import ImageStore, ImageResolver
+from listing import ListingCache
+from scrape import scrape_players, convert_market_value
+
+# Offline benchmark suite for the scraping layer and app startup. Everything
+# runs against the fixture corpus served by a local FixtureServer, no
+# network needed.
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times), result
+
+# ----------------------------
+# get_players: cold scrape, sequential vs concurrent, memory vs page count
+# ----------------------------
+def bench_scrape(server, repeat, pages):
+    fetch.RATE = 1000.0  # time the scraper, not the per-host politeness limit
+    seq = timed(lambda: scrape_players(max_workers=1, base_url=server.listing_url), repeat)
+    con = timed(lambda: scrape_players(max_workers=4, base_url=server.listing_url), repeat)
+    assert seq[2].equals(con[2]), "concurrent fetch returned a different DataFrame"
+    with tempfile.TemporaryDirectory() as tmp:
+        # hourly refresh of an unchanged listing: every page answers 304
+        cache = ListingCache(os.path.join(tmp, "listing.sqlite"))
+        scrape_players(base_url=server.listing_url, cache=cache)
+        cond = timed(lambda: scrape_players(base_url=server.listing_url, cache=cache), repeat)
+    assert cond[2].equals(con[2]), "conditional refresh returned a different DataFrame"
+    results = {
+        "scrape_sequential_s": seq[0],
+        "scrape_concurrent_s": con[0],
+        "scrape_conditional_s": cond[0],
+        "scrape_players": len(con[2]),
+    }
+    for n in pages:
+        tracemalloc.start()
+        df = scrape_players(pages=n, base_url=server.listing_url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"scrape_peak_mb_{n}_pages"] = peak / 2**20
+        results[f"scrape_rows_{n}_pages"] = len(df)
+        assert len(df) == n * PLAYERS_PER_PAGE, f"{n} pages gave {len(df)} players, not {n * PLAYERS_PER_PAGE}"
+    return results
+
+# ----------------------------
+# convert_market_value over a large input
+# ----------------------------
+def bench_convert(size, repeat):
+    rng = random.Random(0)
+    values = [f"€{rng.uniform(1, 200):.2f}m" for _ in range(size)] + ["€500k", "-"] * (size // 100)
+    best, _, converted = timed(lambda: [convert_market_value(v) for v in values], repeat)
+    return {
+        "convert_values": len(values),
+        "convert_s": best,
+        "convert_ns_per_value": best / len(values) * 1e9,
+        "convert_none": sum(v is None for v in converted),
+    }
+
+# ----------------------------
+# get_wikipedia_image end to end: cold single lookups, bulk resolve, warm reads
+# ----------------------------
+def bench_images(server, limit):
+    images.WIKIPEDIA_API = server.wikipedia_api_url
+    names = list(wikipedia_index())[:limit] + ["Nobody Atall"]
+    with tempfile.TemporaryDirectory() as tmp:
+        resolver = ImageResolver(ImageStore(os.path.join(tmp, "images.sqlite")))
+        latencies = []
+        for name in names:
+            start = time.perf_counter()
+            resolver.get(name)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        found = sum(resolver.store.lookup(name)[1] is not None for name in names)
+
+        bulk = ImageResolver(ImageStore(os.path.join(tmp, "bulk.sqlite")))
+        start = time.perf_counter()
+        bulk.resolve_all(names)
+        bulk_time = time.perf_counter() - start
+
+        reloaded = ImageResolver(ImageStore(os.path.join(tmp, "bulk.sqlite")))
+        start = time.perf_counter()
+        for name in names:
+            reloaded.get(name)
+        warm_time = time.perf_counter() - start
+    return {
+        "images_lookups": len(names),
+        "images_found": found,
+        "images_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "images_p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "images_sequential_s": sum(latencies),
+        "images_bulk_s": bulk_time,
+        "images_warm_us_per_lookup": warm_time / len(names) * 1e6,
+    }
+
+# ----------------------------
+# Startup: cold imports and first Home render, each in a fresh interpreter
+# ----------------------------
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STARTUP_MODULES = ["packages", "metrics", "game", "scrape", "footdle", "playerinfo", "simulate"]
+HOME_RENDER = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60)
+at.run()
+assert not at.exception, at.exception
+print(time.perf_counter() - start)
+"""
+
+def fresh_python(code):
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def bench_startup(repeat):
+    results = {}
+    for module in STARTUP_MODULES:
+        code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+        results[f"startup_import_{module}_s"] = min(fresh_python(code) for _ in range(repeat))
+    home = HOME_RENDER.format(app=os.path.join(ROOT, "projekt.py"))
+    results["startup_home_render_s"] = min(fresh_python(home) for _ in range(repeat))
+    return results
+
+# ----------------------------
+# CI comparison
+# ----------------------------
+def compare(results, baseline, tolerance):
+    # flags any timing/memory metric (*_s, *_ms, *_mb...) more than tolerance above baseline
+    regressions = []
+    for key, base in baseline.items():
+        if key.endswith(("_s", "_ms")) or "_mb" in key:
+            if key in results and base > 0 and results[key] > base * (1 + tolerance):
+                regressions.append(f"{key}: {results[key]:.4f} vs baseline {base:.4f}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for the scraping layer")
+    parser.add_argument("--only", choices=["scrape", "convert", "images", "startup"], nargs="+", default=["scrape", "convert", "images", "startup"])
+    parser.add_argument("--delay", type=float, default=0.05, help="simulated latency per request (s)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pages", type=int, nargs="+", default=[4, 16, 64], help="page counts for the memory run")
+    parser.add_argument("--values", type=int, default=1_000_000, help="inputs for convert_market_value")
+    parser.add_argument("--images", type=int, default=50, help="players looked up on Wikipedia")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json file and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = {}
+    with FixtureServer(delay=args.delay) as server:
+        if "scrape" in args.only:
+            results.update(bench_scrape(server, args.repeat, args.pages))
+        if "images" in args.only:
+            results.update(bench_images(server, args.images))
+    if "convert" in args.only:
+        results.update(bench_convert(args.values, args.repeat))
+    if "startup" in args.only:
+        results.update(bench_startup(args.repeat))
+
+    for key, value in results.items():
+        print(f"{key:32s} {value:12.4f}" if isinstance(value, float) else f"{key:32s} {value:12d}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from packages import BeautifulSoup, SoupStrainer, HTML_PARSER, ThreadPoolExecutor, os
+from fetch import Fetcher
+from snapshot import DATA_DIR
+from kvstore import KeyValueStore
+import metrics
+
+# ----------------------------
+# Persistent club -> league store
+# ----------------------------
+# Every listing row links to the player's club page, and the club page
+# header names the club's league. Leagues change at most once a season, so
+# a club is looked up once, kept for LEAGUE_TTL and shared by all of its
+# players: a pool of thousands of players costs one request per club.
+CLUBS_PATH = os.path.join(DATA_DIR, "clubs.sqlite")
+LEAGUE_TTL = 90 * 24 * 3600      # resolved leagues are kept for three months
+CLUB_WORKERS = 4                 # concurrent club page requests
+CLUB_TIMEOUT = 10                # seconds per club page
+CLUB_HEADER = SoupStrainer("span", class_="data-header__club")  # parse only the league link
+
+class ClubStore(KeyValueStore):
+    # club id -> league, None meaning "page had no league"
+    def __init__(self, path=CLUBS_PATH):
+        super().__init__(path, ttl=LEAGUE_TTL)
+
+# ----------------------------
+# Resolution: one club page per club
+# ----------------------------
+def resolve_league(url, fetcher):
+    res = fetcher.get(url)
+    res.raise_for_status()
+    soup = BeautifulSoup(res.content, HTML_PARSER, parse_only=CLUB_HEADER)
+    link = soup.find("a")
+    league = (link.get("title") or link.text.strip()) if link else None
+    soup.decompose()
+    return league or None
+
+class ClubResolver:
+    def __init__(self, store, max_workers=CLUB_WORKERS):
+        self.store = store
+        self.max_workers = max_workers
+        # same host as the listing, so it shares its pacing and circuit breaker
+        self.fetcher = Fetcher("transfermarkt_club", pool_size=max_workers, headers={"User-Agent": "Mozilla/5.0"}, timeout=CLUB_TIMEOUT)
+
+    def _resolve(self, item):
+        club_id, (_, url) = item
+        try:
+            return club_id, resolve_league(url, self.fetcher)
+        except Exception:
+            return club_id, False  # network error, not a negative result
+
+    def leagues(self, clubs):
+        # clubs: club id -> (club, url). Returns club id -> league for every
+        # club with a known league, fetching only the missing ones.
+        leagues = {}
+        missing = {}
+        for club_id, club_url in clubs.items():
+            known, league = self.store.lookup(club_id)
+            metrics.count("cache_requests", cache="clubs")
+            if league:
+                leagues[club_id] = league  # an expired entry still beats "Unknown"
+            if not known:
+                missing[club_id] = club_url
+        if not missing:
+            return leagues
+        metrics.count("cache_misses", value=len(missing), cache="clubs")
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for club_id, league in pool.map(self._resolve, missing.items()):
+                if league is False:
+                    continue
+                results[club_id] = league
+                if league:
+                    leagues[club_id] = league
+        if results:
+            self.store.save(results)
+        return leagues
@@ -0,0 +1,141 @@
+from packages import st, os, sqlite3, threading, time, hashlib, datetime, timezone
+from snapshot import DATA_DIR
+
+# ----------------------------
+# Daily puzzle
+# ----------------------------
+# Every session plays the same secret on a given day. The first request of
+# the day derives it from a seed, the dataset version and the date, and
+# pins the player's name in the results store; later requests, including
+# ones on a dataset version published during the day, look that name up,
+# so a refresh does not change the puzzle or mix results across secrets.
+DAILY_SEED = os.environ.get("FOOTDLE_DAILY_SEED", "footdle")
+RESULTS_PATH = os.path.join(DATA_DIR, "daily.sqlite")
+TOP_N = 10               # rows kept in the precomputed leaderboard
+LEADERBOARD_TTL = 5      # seconds a leaderboard read is cached for all sessions
+BUSY_TIMEOUT_MS = 5000   # how long a writer waits for the lock
+
+def today():
+    return datetime.now(timezone.utc).date().isoformat()
+
+def daily_secret(version, n, day=None):
+    digest = hashlib.sha256(f"{DAILY_SEED}:{version}:{day or today()}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") % n
+
+def daily_puzzle(engine, version, day=None):
+    # the secret's row in this version's engine
+    day = day or today()
+    drawn = daily_secret(version, engine.n, day)
+    name = results_store().pin_puzzle(day, engine.names[drawn], version)
+    return engine.index.get(name, drawn)  # the pinned player left the pool: today's draw instead
+
+# ----------------------------
+# Results store
+# ----------------------------
+# Raw results go into an SQLite file in WAL mode (readers never block the
+# single writer, writers queue on busy_timeout). Each insert updates the
+# per-day aggregates in the same transaction, so the leaderboard only reads
+# a handful of precomputed rows however many games were played.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    day TEXT, session TEXT, nickname TEXT, version TEXT,
+    guesses INTEGER, won INTEGER, finished_at REAL,
+    PRIMARY KEY (day, session)
+);
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT PRIMARY KEY, players INTEGER, wins INTEGER, win_guesses INTEGER
+);
+CREATE TABLE IF NOT EXISTS daily_histogram (
+    day TEXT, guesses INTEGER, players INTEGER,
+    PRIMARY KEY (day, guesses)
+);
+CREATE TABLE IF NOT EXISTS daily_top (
+    day TEXT, session TEXT, nickname TEXT, guesses INTEGER, finished_at REAL,
+    PRIMARY KEY (day, session)
+);
+CREATE TABLE IF NOT EXISTS daily_puzzle (
+    day TEXT PRIMARY KEY, name TEXT, version TEXT
+);
+"""
+
+class ResultsStore:
+    def __init__(self, path=RESULTS_PATH):
+        self.path = path
+        self.local = threading.local()  # one connection per thread
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def pin_puzzle(self, day, name, version):
+        # the name pinned for the day, pinning the given one if there is none yet
+        conn = self._conn()
+        row = conn.execute("SELECT name FROM daily_puzzle WHERE day = ?", (day,)).fetchone()
+        if row is None:
+            conn.execute("INSERT OR IGNORE INTO daily_puzzle VALUES (?, ?, ?)", (day, name, version))
+            row = conn.execute("SELECT name FROM daily_puzzle WHERE day = ?", (day,)).fetchone()
+        return row[0]
+
+    def record(self, day, session, nickname, version, guesses, won):
+        # one result per session and day; returns False if it was already in
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (day, session, nickname, version, guesses, int(won), now),
+            ).rowcount
+            if inserted:
+                conn.execute(
+                    "INSERT INTO daily_stats VALUES (?, 1, ?, ?) ON CONFLICT(day) DO UPDATE SET "
+                    "players = players + 1, wins = wins + excluded.wins, win_guesses = win_guesses + excluded.win_guesses",
+                    (day, int(won), guesses if won else 0),
+                )
+                if won:
+                    conn.execute(
+                        "INSERT INTO daily_histogram VALUES (?, ?, 1) ON CONFLICT(day, guesses) DO UPDATE SET players = players + 1",
+                        (day, guesses),
+                    )
+                    conn.execute("INSERT INTO daily_top VALUES (?, ?, ?, ?, ?)", (day, session, nickname, guesses, now))
+                    conn.execute(
+                        "DELETE FROM daily_top WHERE day = ? AND session NOT IN "
+                        "(SELECT session FROM daily_top WHERE day = ? ORDER BY guesses, finished_at LIMIT ?)",
+                        (day, day, TOP_N),
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return bool(inserted)
+
+    def leaderboard(self, day):
+        conn = self._conn()
+        stats = conn.execute("SELECT players, wins, win_guesses FROM daily_stats WHERE day = ?", (day,)).fetchone()
+        players, wins, win_guesses = stats or (0, 0, 0)
+        histogram = conn.execute("SELECT guesses, players FROM daily_histogram WHERE day = ? ORDER BY guesses", (day,)).fetchall()
+        top = conn.execute("SELECT nickname, guesses FROM daily_top WHERE day = ? ORDER BY guesses, finished_at", (day,)).fetchall()
+        return {
+            "players": players,
+            "wins": wins,
+            "mean_guesses": win_guesses / wins if wins else None,
+            "histogram": histogram,
+            "top": top,
+        }
+
+@st.cache_resource
+def results_store():
+    return ResultsStore(RESULTS_PATH)
+
+@st.cache_data(ttl=LEADERBOARD_TTL, show_spinner=False)
+def get_leaderboard(day):
+    # shared by all sessions, so a burst of reruns costs one read every few seconds
+    return results_store().leaderboard(day)
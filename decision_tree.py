@@ -0,0 +1,121 @@
+import argparse
+import gzip
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from packages import np, os
+from feedback import FeedbackEngine, ALL_EQUAL
+from snapshot import DATA_DIR, dataset_version
+from solver import entropies, feedback_block, MAX_SCORED
+
+# ----------------------------
+# Precomputed decision tree for the Impossible bot
+# ----------------------------
+# For a fixed player pool the best guessing strategy does not change, so it
+# is searched once offline: node = [guess, {feedback code: child node}].
+# The bot then walks the tree with the feedback it gets, no per-turn work.
+# The search keeps the WIDTH best guesses by entropy at the root, halving
+# the width per level, and minimises the expected number of guesses with
+# branch-and-bound. Trees are stored per dataset version under data/trees.
+TREES_DIR = os.path.join(DATA_DIR, "trees")
+WIDTH = 8
+
+def tree_path(version):
+    return os.path.join(TREES_DIR, f"{version}.json.gz")
+
+def top_guesses(engine, candidates, width, rng):
+    guesses = candidates
+    if len(guesses) > MAX_SCORED:
+        guesses = np.sort(rng.choice(candidates, MAX_SCORED, replace=False))
+    scores = entropies(engine, guesses, candidates)
+    order = np.argsort(-scores, kind="stable")
+    return guesses[order[:width]]
+
+def build_node(engine, candidates, width, rng, bound=np.inf):
+    # returns (node, expected guesses to finish from here)
+    if len(candidates) == 1:
+        return [int(candidates[0]), {}], 1.0
+    best = None, np.inf
+    for guess in top_guesses(engine, candidates, max(1, width), rng):
+        node, cost = build_for_guess(engine, guess, candidates, width, rng, min(bound, best[1]))
+        if cost < best[1]:
+            best = node, cost
+    return best
+
+def build_for_guess(engine, guess, candidates, width, rng, bound=np.inf):
+    codes = feedback_block(engine, [guess], candidates)[0]
+    children = {}
+    total = len(candidates)  # every candidate costs this guess
+    for code in np.unique(codes):
+        if code == ALL_EQUAL:
+            continue
+        part = candidates[codes == code]
+        child, cost = build_node(engine, part, width // 2, rng)
+        children[int(code)] = child
+        total += len(part) * cost
+        if total / len(candidates) >= bound:
+            return None, np.inf  # already worse than a sibling guess
+    return [int(guess), children], total / len(candidates)
+
+_engine = None
+
+def _init_worker(df):
+    global _engine
+    _engine = FeedbackEngine(df)
+
+def _build_root_branch(guess, width, seed):
+    candidates = np.arange(_engine.n)
+    return build_for_guess(_engine, guess, candidates, width, np.random.default_rng(seed))
+
+def build_tree(df, width=WIDTH, workers=None, seed=0):
+    # root guesses are searched in parallel, one process per branch
+    engine = FeedbackEngine(df)
+    rng = np.random.default_rng(seed)
+    roots = top_guesses(engine, np.arange(engine.n), width, rng)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(df)
+        results = [_build_root_branch(int(g), width, seed) for g in roots]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df,)) as pool:
+            results = list(pool.map(_build_root_branch, [int(g) for g in roots], [width] * len(roots), [seed] * len(roots)))
+    return min(results, key=lambda result: result[1])
+
+def save_tree(tree, cost, version):
+    os.makedirs(TREES_DIR, exist_ok=True)
+    tmp_path = tree_path(version) + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump({"version": version, "expected_guesses": cost, "root": tree}, f, separators=(",", ":"))
+    os.replace(tmp_path, tree_path(version))
+
+def _from_json(node):
+    guess, children = node
+    return guess, {int(code): _from_json(child) for code, child in children.items()}
+
+def load_tree(version):
+    path = tree_path(version)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return _from_json(json.load(f)["root"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Impossible bot's decision tree for the current player pool")
+    parser.add_argument("--data", choices=["snapshot", "fixtures"], default="snapshot")
+    parser.add_argument("--synthetic", type=int, help="use a synthetic pool of this many players")
+    parser.add_argument("--width", type=int, default=WIDTH, help="guesses searched at the root")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from simulate import load_players
+    df = load_players(args)
+    version = dataset_version(df)
+    start = time.perf_counter()
+    tree, cost = build_tree(df, width=args.width, workers=args.workers, seed=args.seed)
+    save_tree(tree, cost, version)
+    print(f"{len(df)} players, version {version}: expected {cost:.3f} guesses, built in {time.perf_counter() - start:.1f}s -> {tree_path(version)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from packages import pd, np
+
+# ----------------------------
+# Footdle feedback engine
+# ----------------------------
+# Every attribute is encoded once as integer codes (categories) or floats
+# (Age, Market Value). The feedback of a guess against a secret is packed
+# into 2 bits per attribute, 12 bits in total, and for pools up to
+# MATRIX_LIMIT players the whole N x N matrix is precomputed, so any
+# guess-vs-secret lookup is a single array index.
+ATTRIBUTES = ["Position", "Age", "Country", "Club", "League", "Market Value (€ mil.)"]
+ORDERED = {"Age", "Market Value (€ mil.)"}  # attributes with up/down arrows
+
+EQUAL = 0   # green tile
+HIGHER = 1  # red, secret value is higher (arrow up)
+LOWER = 2   # red, secret value is lower (arrow down)
+WRONG = 3   # red, no arrow
+ALL_EQUAL = 0
+MATRIX_LIMIT = 5000  # 5000^2 uint16 = 50 MB, larger pools compute rows on demand
+CHUNK = 512          # guesses per block while building the matrix
+
+def decode(code):
+    return {attr: (int(code) >> (2 * shift)) & 3 for shift, attr in enumerate(ATTRIBUTES)}
+
+class FeedbackEngine:
+    def __init__(self, df):
+        self.names = df["Name"].tolist()
+        self.n = len(self.names)
+        self.index = {}
+        for i, name in enumerate(self.names):
+            self.index.setdefault(name, i)
+        self.values = []
+        for attr in ATTRIBUTES:
+            if attr in ORDERED:
+                self.values.append(pd.to_numeric(df[attr], errors="coerce").to_numpy(dtype=float, na_value=np.nan))
+            else:
+                self.values.append(pd.factorize(df[attr])[0])  # categorical columns reuse their codes
+        self.matrix = None
+        if self.n <= MATRIX_LIMIT:
+            self.matrix = np.empty((self.n, self.n), dtype=np.uint16)
+            for start in range(0, self.n, CHUNK):
+                guesses = np.arange(start, min(start + CHUNK, self.n))
+                self.matrix[guesses] = self._compute(guesses)
+            self.matrix.setflags(write=False)
+
+    def rows(self, guesses, secrets=None):
+        # feedback of each guess against every player (or only the given
+        # secrets), shape (len(guesses), n or len(secrets))
+        guesses = np.asarray(guesses)
+        if self.matrix is not None:
+            return self.matrix[guesses] if secrets is None else self.matrix[np.ix_(guesses, secrets)]
+        return self._compute(guesses, secrets)
+
+    def _compute(self, guesses, secrets=None):
+        packed = np.zeros((len(guesses), self.n if secrets is None else len(secrets)), dtype=np.uint16)
+        for shift, (attr, values) in enumerate(zip(ATTRIBUTES, self.values)):
+            guess = values[guesses][:, None]
+            secret = (values if secrets is None else values[secrets])[None, :]
+            if attr in ORDERED:
+                # HIGHER = 1 and LOWER = 2 as two bit flags, EQUAL when neither
+                code = (secret > guess).astype(np.uint16) | ((secret < guess).astype(np.uint16) << np.uint16(1))
+                guess_nan, secret_nan = np.isnan(guess[:, 0]), np.isnan(secret[0])
+                if guess_nan.any() or secret_nan.any():
+                    # a missing value only equals another missing value
+                    code[guess_nan] = WRONG
+                    code[:, secret_nan] = WRONG
+                    code[np.ix_(guess_nan, secret_nan)] = EQUAL
+            else:
+                code = (secret != guess).astype(np.uint16) * np.uint16(WRONG)
+            packed |= code << np.uint16(2 * shift)
+        return packed
+
+    def row(self, guess):
+        return self.rows([guess])[0]
+
+    def feedback(self, guess, secret):
+        if self.matrix is not None:
+            return int(self.matrix[guess, secret])
+        return int(self._compute([guess], [secret])[0, 0])
+
+    def name_feedback(self, guess_name, secret_name):
+        return self.feedback(self.index[guess_name], self.index[secret_name])
@@ -0,0 +1,161 @@
+from packages import requests, HTTPAdapter, random, threading, time, urlsplit
+import metrics
+
+# ----------------------------
+# Shared fetch layer
+# ----------------------------
+# Requests to Transfermarkt go through a Fetcher: bounded (connect, read)
+# timeouts, a few retries with jittered exponential backoff, a pacer per
+# host that slows down when the site answers 429 / 503 (and honours
+# Retry-After), and a circuit breaker per host. While a host keeps failing
+# the breaker fails fetches at once, so callers fall back to their last
+# good data instead of waiting out timeouts on every refresh.
+CONNECT_TIMEOUT = 3.05   # seconds to open a connection
+READ_TIMEOUT = 10        # seconds between bytes of a response
+RETRIES = 3              # attempts after the first one
+BACKOFF = 0.5            # seconds before the first retry, doubled per attempt (full jitter)
+MAX_BACKOFF = 8
+DEADLINE = 30            # seconds one fetch may take, retries included
+RATE = 10.0              # requests per second per host, at most
+BURST = 4                # requests a host may get back to back
+MIN_RATE = 0.5           # floor when the host keeps throttling
+BREAKER_FAILURES = 5     # failed fetches in a row that open the circuit
+BREAKER_RESET = 60       # seconds before one trial request is let through
+RETRY_STATUS = {429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+
+class FetchError(Exception):
+    pass
+
+class CircuitOpen(FetchError):
+    pass
+
+class Pacer:
+    # token bucket: the rate halves when the host throttles us and creeps
+    # back up with every good response
+    def __init__(self, rate=RATE, burst=BURST):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(delay)
+
+    def throttled(self, retry_after=None):
+        with self.lock:
+            self.rate = max(MIN_RATE, self.rate / 2)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def ok(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + 0.5)
+
+class CircuitBreaker:
+    # closed -> open after `failures` failed fetches in a row; once
+    # reset_after has passed a single trial fetch decides whether it closes
+    def __init__(self, failures=BREAKER_FAILURES, reset_after=BREAKER_RESET):
+        self.failures = failures
+        self.reset_after = reset_after
+        self.failed = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if not self.trial and time.monotonic() - self.opened_at >= self.reset_after:
+                self.trial = True  # half-open
+                return True
+            return False
+
+    def record(self, ok):
+        with self.lock:
+            if ok:
+                self.failed = 0
+                self.opened_at = None
+            else:
+                self.failed += 1
+                if self.trial or self.failed >= self.failures:
+                    self.opened_at = time.monotonic()
+            self.trial = False
+
+_hosts = {}  # host -> (Pacer, CircuitBreaker), shared by every Fetcher
+_hosts_lock = threading.Lock()
+
+def host_state(url):
+    host = urlsplit(url).netloc
+    with _hosts_lock:
+        if host not in _hosts:
+            _hosts[host] = (Pacer(RATE, BURST), CircuitBreaker())
+        return _hosts[host]
+
+def retry_after(res):
+    # Retry-After in seconds (the HTTP-date form is rare enough to ignore)
+    try:
+        return min(MAX_BACKOFF * 4, float(res.headers.get("Retry-After", "")))
+    except ValueError:
+        return None
+
+class Fetcher:
+    def __init__(self, site, pool_size=4, headers=None, timeout=READ_TIMEOUT, retries=RETRIES, deadline=DEADLINE):
+        self.site = site  # metrics label
+        self.timeout = (CONNECT_TIMEOUT, timeout)
+        self.retries = retries
+        self.deadline = deadline
+        # one keep-alive connection pool shared by all fetch threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(headers or {})
+
+    def get(self, url, headers=None):
+        # the response for anything but a retryable status; raises FetchError
+        # once retries or the deadline run out, CircuitOpen without trying
+        pacer, breaker = host_state(url)
+        if not breaker.allow():
+            metrics.count("http_requests", site=self.site, status="circuit_open")
+            raise CircuitOpen(f"{urlsplit(url).netloc} keeps failing, skipped {url}")
+        start = time.monotonic()
+        for attempt in range(self.retries + 1):
+            pacer.wait()
+            wait = 0.0
+            try:
+                with metrics.timed("http_request", site=self.site):
+                    res = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                metrics.count("http_requests", site=self.site, status="error")
+                error = e
+            else:
+                metrics.count("http_requests", site=self.site, status=res.status_code)
+                if res.status_code not in RETRY_STATUS:
+                    pacer.ok()
+                    breaker.record(True)
+                    return res
+                error = FetchError(f"HTTP {res.status_code} from {url}")
+                if res.status_code in THROTTLE_STATUS:
+                    wait = retry_after(res) or 0.0
+                    pacer.throttled(wait)
+            delay = max(wait, random.uniform(0, min(MAX_BACKOFF, BACKOFF * 2 ** attempt)))
+            if attempt == self.retries or time.monotonic() - start + delay > self.deadline:
+                break
+            metrics.count("http_retries", site=self.site)
+            time.sleep(delay)
+        breaker.record(False)
+        raise FetchError(f"giving up on {url} after {attempt + 1} attempts: {error}") from error
@@ -0,0 +1,320 @@
+import argparse
+import json
+import random
+import hashlib
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs, quote, unquote
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+LISTING_PATH = "/spieler-statistik/wertvollstespieler/marktwertetop"
+PLAYERS_PER_PAGE = 25
+
+# ----------------------------
+# Corpus: Transfermarkt listing pages + Wikipedia infobox pages
+# ----------------------------
+def listing_files():
+    return sorted((FIXTURES_DIR / "transfermarkt").glob("page-*.html"), key=lambda p: int(p.stem.split("-")[1]))
+
+def wikipedia_index():
+    path = FIXTURES_DIR / "wikipedia" / "index.json"
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+def wikipedia_file(title):
+    return FIXTURES_DIR / "wikipedia" / f"{title.replace(' ', '_')}.html"
+
+def record(pages=4, images=True):
+    # re-records the corpus from the live sites, trimmed to the parts we parse
+    from packages import requests, BeautifulSoup, wikipedia
+    from scrape import BASE_URL, HEADERS, iter_player_rows
+
+    (FIXTURES_DIR / "transfermarkt").mkdir(parents=True, exist_ok=True)
+    (FIXTURES_DIR / "wikipedia").mkdir(parents=True, exist_ok=True)
+    names = []
+    for page in range(1, pages + 1):
+        res = requests.get(f"{BASE_URL}?page={page}", headers=HEADERS, timeout=30)
+        table = BeautifulSoup(res.content, "html.parser").find("table", class_="items")
+        html = f"<html><body><div class='responsive-table'>{table}</div></body></html>"
+        (FIXTURES_DIR / "transfermarkt" / f"page-{page}.html").write_text(html, encoding="utf-8")
+        names += [row[0] for row in iter_player_rows(html)]
+
+    index = {}
+    for name in names if images else []:
+        try:
+            title = wikipedia.search(name)[0]
+            res = requests.get(wikipedia.page(title).url, timeout=30)
+            infobox = BeautifulSoup(res.content, "html.parser").find("table", {"class": "infobox"})
+        except Exception:
+            continue
+        if infobox:
+            index[name] = title
+            wikipedia_file(title).write_text(f"<html><body>{infobox}</body></html>", encoding="utf-8")
+    (FIXTURES_DIR / "wikipedia" / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+
+# ----------------------------
+# Synthetic corpus (same markup, deterministic content)
+# ----------------------------
+FIRST_NAMES = ["Lucas", "Mateo", "Jamal", "Kai", "Florian", "Rodrigo", "Bukayo", "Vinicius", "Pedro", "Rafael",
+               "Martin", "Julian", "Declan", "Phil", "Federico", "Khvicha", "Nico", "Joao", "Bruno", "Alexis"]
+LAST_NAMES = ["Silva", "Hernandez", "Muller", "Rossi", "Dubois", "Kovacs", "Santos", "Walker", "Jensen", "Novak",
+              "Garcia", "Moreau", "Schmidt", "Ferreira", "Costa"]
+COUNTRIES = ["England", "France", "Spain", "Germany", "Brazil", "Portugal", "Argentina", "Netherlands",
+             "Italy", "Belgium", "Norway", "Uruguay", "Georgia", "Croatia"]
+# clubs missing from scrape.CLUB_TO_LEAGUE, only resolvable from their club page
+EXTRA_CLUBS = {"SSC Napoli": "Serie A", "Olympique Marseille": "Ligue 1", "Bologna FC 1909": "Serie A", "AS Monaco": "Ligue 1"}
+CLUB_LINK = re.compile(r'href="/[^"]*/startseite/verein/(\d+)" title="([^"]+)"')
+PLAYER_LINK = re.compile(rb"/spieler/(\d+)")
+REPEAT_ID_OFFSET = 10**7  # added to player ids once per repeat of the corpus
+
+def _slug(text):
+    return "".join(c if c.isalnum() else "-" for c in text.lower()).strip("-")
+
+def listing_row(i, player):
+    return f"""
+<tr class="{'odd' if i % 2 else 'even'}">
+<td class="zentriert">{i}</td>
+<td class="posrela"><table class="inline-table"><tr>
+<td rowspan="2"><img alt="{player['name']}" class="bilderrahmen-fixed" src="https://img.a.transfermarkt.technology/portrait/small/{player['id']}.jpg" title="{player['name']}"/></td>
+<td class="hauptlink"><a href="/{_slug(player['name'])}/profil/spieler/{player['id']}" title="{player['name']}">{player['name']}</a></td>
+</tr><tr><td>{player['position']}</td></tr></table></td>
+<td class="zentriert">{player['age']}</td>
+<td class="zentriert"><img alt="{player['country']}" class="flaggenrahmen" title="{player['country']}"/><br/></td>
+<td class="zentriert"><a href="/{_slug(player['club'])}/startseite/verein/{player['club_id']}" title="{player['club']}"><img alt="{player['club']}" class="tiny_wappen" title="{player['club']}"/></a></td>
+<td class="rechts hauptlink"><a href="/{_slug(player['name'])}/marktwertverlauf/spieler/{player['id']}">{player['value']}</a></td>
+</tr>"""
+
+def club_page(club, league):
+    return f"""<html><body><header class="data-header">
+<h1 class="data-header__headline-wrapper">{club}</h1>
+<div class="data-header__box--big"><span class="data-header__club" itemprop="affiliation"><a title="{league}" href="/{_slug(league)}/startseite/wettbewerb/X1">{league}</a></span></div>
+</header></body></html>"""
+
+def infobox_page(title, player):
+    file_name = quote(title.replace(" ", "_"))
+    return f"""<html><body><table class="infobox vcard"><tbody>
+<tr><th colspan="2" class="infobox-above fn">{title}</th></tr>
+<tr><td colspan="2" class="infobox-image"><span typeof="mw:File"><a href="/wiki/File:{file_name}.jpg" class="mw-file-description"><img src="//upload.wikimedia.org/wikipedia/commons/thumb/0/0{player['id'] % 10}/{file_name}.jpg/220px-{file_name}.jpg" decoding="async" width="220" height="293" class="mw-file-element"/></a></span></td></tr>
+<tr><th scope="row" class="infobox-label">Position</th><td class="infobox-data role">{player['position']}</td></tr>
+<tr><th scope="row" class="infobox-label">Current team</th><td class="infobox-data org">{player['club']}</td></tr>
+</tbody></table></body></html>"""
+
+def generate(pages=4, seed=42):
+    from scrape import POSITION_MAP, CLUB_TO_LEAGUE
+
+    rng = random.Random(seed)
+    clubs = list(CLUB_TO_LEAGUE) + list(EXTRA_CLUBS)
+    names = rng.sample([f"{f} {l}" for f in FIRST_NAMES for l in LAST_NAMES], pages * PLAYERS_PER_PAGE)
+    players = []
+    for n, name in enumerate(names):
+        club = rng.choice(clubs)
+        value = max(5.0, round(200 * 0.97 ** n - rng.random() * 5, 1))
+        players.append({
+            "id": 100000 + n * 37,
+            "name": name,
+            "position": rng.choice(list(POSITION_MAP)),
+            "age": rng.randint(18, 35),
+            "country": rng.choice(COUNTRIES),
+            "club": club,
+            "club_id": 1000 + clubs.index(club),
+            "value": f"€{value:.2f}m",
+        })
+
+    (FIXTURES_DIR / "transfermarkt").mkdir(parents=True, exist_ok=True)
+    (FIXTURES_DIR / "wikipedia").mkdir(parents=True, exist_ok=True)
+    for page in range(1, pages + 1):
+        chunk = players[(page - 1) * PLAYERS_PER_PAGE:page * PLAYERS_PER_PAGE]
+        rows = "".join(listing_row((page - 1) * PLAYERS_PER_PAGE + i + 1, p) for i, p in enumerate(chunk))
+        html = f"<html><body><div class='responsive-table'><table class=\"items\"><thead><tr><th>#</th></tr></thead><tbody>{rows}\n</tbody></table></div></body></html>\n"
+        (FIXTURES_DIR / "transfermarkt" / f"page-{page}.html").write_text(html, encoding="utf-8")
+
+    index = {}
+    for player in players:
+        if rng.random() < 0.9:  # the rest have no article, exercising the negative path
+            title = f"{player['name']} (footballer)"
+            index[player["name"]] = title
+            wikipedia_file(title).write_text(infobox_page(title, player), encoding="utf-8")
+    (FIXTURES_DIR / "wikipedia" / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+
+def fixture_players():
+    # the corpus' listing pages parsed into the app's player table
+    from packages import pd
+    from scrape import COLUMNS, iter_player_rows
+    from snapshot import typed_players
+    rows = [row for path in listing_files() for row in iter_player_rows(path.read_bytes())]
+    return typed_players(pd.DataFrame(rows, columns=COLUMNS))
+
+def synthetic_players(n, seed=0):
+    # an n-player table with realistic cardinalities, for scaling runs
+    from packages import pd, np
+    from scrape import POSITION_MAP
+    from snapshot import typed_players
+    rng = np.random.default_rng(seed)
+    return typed_players(pd.DataFrame({
+        "Name": [f"Player {i}" for i in range(n)],
+        "Position": rng.choice(list(POSITION_MAP.values()), n),
+        "Age": rng.integers(17, 38, n).astype(str),
+        "Country": rng.choice([f"Country {i}" for i in range(60)], n),
+        "Club": rng.choice([f"Club {i}" for i in range(max(20, n // 25))], n),
+        "League": rng.choice([f"League {i}" for i in range(20)], n),
+        "Market Value (€ mil.)": np.round(rng.uniform(1, 200, n), 1),
+    }))
+
+# ----------------------------
+# Local stand-in server
+# ----------------------------
+class FixtureServer:
+    # Serves the listing at LISTING_PATH?page=N (pages beyond the corpus
+    # repeat it under new player ids, so every page adds distinct players;
+    # each page has an ETag and If-None-Match gets a 304), the
+    # club pages linked from it, a minimal MediaWiki api.php (search, page
+    # info and generator=search with pageimages) and /wiki/<Title> articles.
+    def __init__(self, delay=0.0, host="127.0.0.1", port=0):
+        self.delay = delay
+        self.pages = [p.read_bytes() for p in listing_files()]
+        self.clubs = {club_id: club for page in self.pages for club_id, club in CLUB_LINK.findall(page.decode("utf-8"))}
+        self.index = wikipedia_index()
+        self.titles = set(self.index.values())
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def listing_url(self):
+        return self.url + LISTING_PATH
+
+    @property
+    def wikipedia_api_url(self):
+        return self.url + "/w/api.php"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def search(self, query):
+        query = query.lower()
+        return [title for name, title in self.index.items() if query in name.lower() or query == title.lower()]
+
+    def listing_page(self, page):
+        cycle, index = divmod(page - 1, len(self.pages))
+        body = self.pages[index]
+        if cycle:
+            offset = cycle * REPEAT_ID_OFFSET
+            body = PLAYER_LINK.sub(lambda m: b"/spieler/%d" % (int(m.group(1)) + offset), body)
+        return body
+
+    def club_league(self, club):
+        from scrape import CLUB_TO_LEAGUE  # not at construction: scrape reads its env on import
+        return EXTRA_CLUBS.get(club) or CLUB_TO_LEAGUE.get(club)
+
+    def page_info(self, title):
+        if title not in self.titles:
+            return {"query": {"pages": {"-1": {"title": title, "missing": ""}}}}
+        pageid = str(abs(hash(title)) % 10**7)
+        fullurl = f"{self.url}/wiki/{quote(title.replace(' ', '_'))}"
+        return {"query": {"pages": {pageid: {"pageid": int(pageid), "title": title, "fullurl": fullurl}}}}
+
+    def page_image(self, title):
+        # pageimages thumbnail, taken from the article's infobox image
+        page = {"title": title}
+        match = re.search(r'<img src="([^"]+)"', wikipedia_file(title).read_text(encoding="utf-8"))
+        if match:
+            page["thumbnail"] = {"source": "https:" + match.group(1)}
+        return page
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real sites
+
+            def do_GET(self):
+                if server.delay:
+                    time.sleep(server.delay)  # simulated network round-trip
+                url = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+                if url.path == LISTING_PATH and server.pages:
+                    page = int(params.get("page", 1))
+                    body = server.listing_page(page)
+                    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                    if self.headers.get("If-None-Match") == etag:
+                        self.reply(b"", "text/html", status=304, etag=etag)
+                    else:
+                        self.reply(body, "text/html", etag=etag)
+                elif "/startseite/verein/" in url.path and url.path.rsplit("/", 1)[-1] in server.clubs:
+                    club = server.clubs[url.path.rsplit("/", 1)[-1]]
+                    league = server.club_league(club)
+                    self.reply(club_page(club, league).encode() if league else b"<html></html>", "text/html")
+                elif url.path == "/w/api.php":
+                    if params.get("generator") == "search":
+                        titles = server.search(params.get("gsrsearch", ""))[:int(params.get("gsrlimit", 10))]
+                        body = {"query": {"pages": {str(n): server.page_image(t) for n, t in enumerate(titles)}}} if titles else {}
+                    elif params.get("list") == "search":
+                        titles = server.search(params.get("srsearch", ""))[:int(params.get("srlimit", 10))]
+                        body = {"query": {"search": [{"title": t} for t in titles]}}
+                    else:
+                        body = server.page_info(params.get("titles", ""))
+                    self.reply(json.dumps(body).encode(), "application/json")
+                elif url.path.startswith("/wiki/"):
+                    path = wikipedia_file(unquote(url.path[len("/wiki/"):]).replace("_", " "))
+                    if path.exists():
+                        self.reply(path.read_bytes(), "text/html")
+                    else:
+                        self.reply(b"Not found", "text/plain", status=404)
+                else:
+                    self.reply(b"Not found", "text/plain", status=404)
+
+            def reply(self, body, content_type, status=200, etag=None):
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline fixture corpus for the scraping layer")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="write the deterministic synthetic corpus")
+    gen.add_argument("--pages", type=int, default=4)
+    rec = sub.add_parser("record", help="re-record the corpus from the live sites")
+    rec.add_argument("--pages", type=int, default=4)
+    rec.add_argument("--no-images", action="store_true")
+    srv = sub.add_parser("serve", help="run the stand-in server")
+    srv.add_argument("--port", type=int, default=8765)
+    srv.add_argument("--delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate(args.pages)
+    elif args.command == "record":
+        record(args.pages, images=not args.no_images)
+    else:
+        server = FixtureServer(delay=args.delay, port=args.port)
+        print(f"FOOTDLE_TRANSFERMARKT_URL={server.listing_url}")
+        print(f"FOOTDLE_WIKIPEDIA_API={server.wikipedia_api_url}")
+        server.httpd.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,168 @@
-from packages import st, pd
-from scrape import get_players
+from packages import st, os, uuid
+from scrape import get_player_snapshot, get_players_by_version
+from feedback import FeedbackEngine, decode, EQUAL, HIGHER, LOWER
+from decision_tree import load_tree, tree_path
+from players import get_player_index
+from snapshot import market_value_label
+from daily import today, daily_puzzle, results_store
+from game import FootdleGame, USER_WON, BOT_WON, DRAW, GAVE_UP
+from replay import log_game
+import metrics
+
+# ----------------------------
+# Shared engines (one per dataset version, for every session)
+# ----------------------------
+# Kept here rather than in feedback.py / decision_tree.py so the engine
+# modules, and the simulator's worker processes, never import Streamlit.
+@st.cache_resource(max_entries=2)
+def get_feedback_engine(_df, version):
+    with metrics.timed("feedback_engine_build"):
+        return FeedbackEngine(_df)
+
+@st.cache_resource(max_entries=2)
+def cached_decision_tree(version):
+    return load_tree(version)
+
+def get_decision_tree(version):
+    # a missing tree is not cached, so one built later is picked up
+    if not os.path.exists(tree_path(version)):
+        return None
+    return cached_decision_tree(version)
+
+# The page is a view over game.FootdleGame: the only game state kept per
+# session is st.session_state.footdle_game (indices, no DataFrames).
+def footdle_tables(version):
+    # shared player table and feedback engine of a game's dataset version
+    player_df = get_players_by_version(version)
+    if player_df is None:
+        return None, None
+    return player_df, get_feedback_engine(player_df, version)
+
+def start_game(mode, difficulty=None):
+    player_df, version = get_player_snapshot()
+    engine = get_feedback_engine(player_df, version)
+    secret, day = None, None
+    if mode == "Daily":
+        day = today()
+        secret = daily_puzzle(engine, version, day)  # same secret for every session today
+    st.session_state.footdle_game = FootdleGame.start(engine, version, mode, secret=secret, difficulty=difficulty, day=day)
+
+# ----------------------------
+# Guess grid rendering
+# ----------------------------
+# Each row only depends on the dataset version and the (guess, secret)
+# pair, so its HTML is built once and cached; the page then sends the whole
+# grid as a single markdown element per rerun.
+GREEN = "#3dcc4a"
+RED = "#df2222"
+
+def arrow_svg(state, size):
+    if state == HIGHER:
+        return f"""<svg width="{size}" height="{size}" style="vertical-align:middle;opacity:0.7;" viewBox="0 0 16 16"><path fill="black" d="M8 4l4 8H4z"/></svg>"""
+    elif state == LOWER:
+        return f"""<svg width="{size}" height="{size}" style="vertical-align:middle;opacity:0.7;transform: rotate(180deg);" viewBox="0 0 16 16"><path fill="black" d="M8 4l4 8H4z"/></svg>"""
+    return ""
+
+def one_line(html):
+    # no blank or indented lines, so joined rows stay one HTML block in markdown
+    return "".join(line.strip() for line in html.splitlines())
+
+SOLO_HEADER_HTML = one_line("""
+<div style="display:grid;grid-template-columns:160px repeat(6, 120px);gap:18px;margin-bottom:2px;">
+    <div></div>
+    <div style="text-align:center;font-weight:bold;">POSITION</div>
+    <div style="text-align:center;font-weight:bold;">AGE</div>
+    <div style="text-align:center;font-weight:bold;">COUNTRY</div>
+    <div style="text-align:center;font-weight:bold;">CLUB</div>
+    <div style="text-align:center;font-weight:bold;">LEAGUE</div>
+    <div style="text-align:center;font-weight:bold;">VALUE (€ mil.) </div>
+</div>
+""")
+
+@st.cache_data(max_entries=20000, show_spinner=False)
+def solo_row_html(_player_df, _engine, version, guess_idx, secret_idx):
+    metrics.count("cache_misses", cache="grid_row")
+    states = decode(_engine.feedback(guess_idx, secret_idx))
+    row = _player_df.iloc[guess_idx]
+    bg = {col: GREEN if state == EQUAL else RED for col, state in states.items()}
+    html = f"""
+    <div style="display:grid;grid-template-columns:160px repeat(6, 120px);gap:18px;align-items:center;margin-bottom:10px;">
+        <div style="font-weight:bold;font-size:1.1em;color:b2b8c2;letter-spacing:1px;">{row['Name']}</div>
+        <div style="border:6px solid black; background:{bg['Position']}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;font-size:2em;">{row['Position']}</div>
+        <div style="border:6px solid black; background:{bg['Age']}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;font-size:2em;position:relative;">
+            <span>{row['Age']}</span>
+            <span style="margin-left:8px;">{arrow_svg(states['Age'], 28)}</span>
+        </div>
+        <div style="border:6px solid black; background:{bg['Country']}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;font-size:1.4em;">{row['Country']}</div>
+        <div style="border:6px solid black; background:{bg['Club']}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;white-space:normal;text-align:center;font-size:1.2em;">{row['Club']}</div>
+        <div style="border:6px solid black; background:{bg['League']}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;white-space:normal;text-align:center;font-size:1.2em;">{row['League']}</div>
+        <div style="border:6px solid black; background:{bg['Market Value (€ mil.)']}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;font-size:2em;position:relative;">
+            <span>{market_value_label(row['Market Value (€ mil.)'])}</span>
+            <span style="margin-left:8px;">{arrow_svg(states['Market Value (€ mil.)'], 28)}</span>
+        </div>
+    </div>
+    """
+    return one_line(html)
+
+@st.cache_data(max_entries=20000, show_spinner=False)
+def computer_row_html(_player_df, _engine, version, user_idx, bot_idx, secret_idx):
+    metrics.count("cache_misses", cache="grid_row")
+    # bot_idx is -1 when the bot has not guessed on this turn
+    states = decode(_engine.feedback(user_idx, secret_idx))
+    row = _player_df.iloc[user_idx]
+    bg = {col: GREEN if state == EQUAL else RED for col, state in states.items()}
+
+    bot_guess_str = ""
+    if bot_idx >= 0:
+        bot_states = decode(_engine.feedback(bot_idx, secret_idx))
+        n_correct = sum(state == EQUAL for state in bot_states.values())
+        bot_guess_str = f"<div style='font-weight:bold;color:#0078ff;padding-right:50px;font-size:1.1em;'>{_engine.names[bot_idx]} ({n_correct}/6)</div>"
+
+    html = f"""
+    <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:4px;">
+    <div style="display:grid;grid-template-columns:120px repeat(6, 95px);gap:8px;align-items:center;">
+        <div style="font-weight:bold;font-size:1.1em;padding-right:8px;">{row['Name']}</div>
+        <div style="border:4px solid black; background:{bg['Position']}; border-radius:7px; height:65px; display:flex; align-items:center; justify-content:center;text-align: center; font-size:1.2em;">
+            {row['Position']}
+        </div>
+        <div style="border:4px solid black;background:{bg['Age']}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.2em;">
+            <span>{row['Age']}</span>
+            <span style="margin-left:6px;">{arrow_svg(states['Age'], 18)}</span>
+        </div>
+        <div style="border:4px solid black;background:{bg['Country']}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.1em;">{row['Country']}</div>
+        <div style="border:4px solid black;background:{bg['Club']}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.1em;">{row['Club']}</div>
+        <div style="border:4px solid black;background:{bg['League']}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.1em;">{row['League']}</div>
+        <div style="border:4px solid black;background:{bg['Market Value (€ mil.)']}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.2em;">
+            <span>{market_value_label(row['Market Value (€ mil.)'])}</span>
+            <span style="margin-left:6px;">{arrow_svg(states['Market Value (€ mil.)'], 18)}</span>
+        </div>
+    </div>
+    <div style="min-width:180px;margin-left:30px;text-align:right;">{bot_guess_str}</div>
+    </div>
+    """
+    return one_line(html)
+
+def end_game(game, player_df):
+    # on the turn that finishes a game, or on Restart after a guess
+    if game.finished:
+        record_daily(game)
+    if game.guesses or game.finished:
+        log_game(game, player_df)
+
+def record_daily(game):
+    # stores a finished Daily game once; the store ignores repeats
+    if game.mode != "Daily" or not game.finished:
+        return
+    if "footdle_session_id" not in st.session_state:
+        st.session_state.footdle_session_id = uuid.uuid4().hex
+    results_store().record(
+        game.day,
+        st.session_state.footdle_session_id,
+        st.session_state.get("footdle_player_name") or "Anonymous",
+        game.version,
+        len(game.guesses),
+        game.status == USER_WON,
+    )
 
 def footdle_page():
     st.title("Footdle - Guess the Player!")
@@ -13,9 +176,10 @@ def footdle_page():
         Welcome to **Footdle**!  
         - In **Solo** mode, guess the player in as few tries as possible.  
         - In **Against Computer** mode, you and the bot will compete to see who can guess first!  
+        - In **Daily** mode, everyone gets the same player today. Check the leaderboard afterwards!  
         _Choose your mode below:_
         """)
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
             if st.button("Solo"):
                 st.session_state.footdle_mode = "Solo"
@@ -24,6 +188,10 @@ def footdle_page():
             if st.button("Against Computer"):
                 st.session_state.footdle_mode = "Computer"
                 st.rerun()
+        with col3:
+            if st.button("Daily"):
+                st.session_state.footdle_mode = "Daily"
+                st.rerun()
         
 
         st.markdown("---")
@@ -84,80 +252,73 @@ def footdle_page():
    
     if st.button("⬅ Back to mode select"):
         st.session_state.footdle_mode = None
-        st.session_state.footdle_started = False
-        st.session_state.footdle_secret = None
-        st.session_state.footdle_guesses = []
-        st.session_state.footdle_gave_up_message = False
-        st.session_state.footdle_win_message = False
+        st.session_state.footdle_game = None
         st.rerun()
 
-    # === SOLO MODE ===
-    if st.session_state.footdle_mode == "Solo":
-        
-        if "footdle_started" not in st.session_state:
-            st.session_state.footdle_started = False
-        if "footdle_secret" not in st.session_state:
-            st.session_state.footdle_secret = None
-        if "footdle_guesses" not in st.session_state:
-            st.session_state.footdle_guesses = []
-        if "footdle_gave_up_message" not in st.session_state:
-            st.session_state.footdle_gave_up_message = False
-        if "footdle_win_message" not in st.session_state:
-            st.session_state.footdle_win_message = False
-
-      
-        if not st.session_state.footdle_started:
+    game = st.session_state.get("footdle_game")
+    if game is not None and game.mode != st.session_state.footdle_mode:
+        game = None
+    if game is not None:
+        player_df, engine = footdle_tables(game.version)
+        if engine is None:
+            st.warning("The player data were refreshed in the meantime, please start a new game.")
+            game = st.session_state.footdle_game = None
+
+    # === SOLO / DAILY MODE ===
+    if st.session_state.footdle_mode in ("Solo", "Daily"):
+        daily = st.session_state.footdle_mode == "Daily"
+
+        if game is None or game.finished:
+            if daily:
+                st.markdown(f"### 📅 Daily puzzle – {today()}")
+                # the widget's key is dropped while a game hides it, so the
+                # name is kept under its own key from Start on
+                st.text_input("Nickname for the leaderboard:", value=st.session_state.get("footdle_player_name", ""),
+                              key="footdle_nickname", max_chars=20)
             if st.button("Start"):
-                player_df = get_players()
-                st.session_state.footdle_player_df = player_df
-                secret_row = player_df.sample(1).iloc[0]
-                st.session_state.footdle_secret = secret_row.to_dict()
-                st.session_state.footdle_guesses = []
-                st.session_state.footdle_started = True
-                st.session_state.footdle_gave_up_message = False
-                st.session_state.footdle_win_message = False
+                if daily:
+                    st.session_state.footdle_player_name = st.session_state.get("footdle_nickname", "")
+                start_game(st.session_state.footdle_mode)
                 st.rerun()
-            st.stop()
-
-        player_df = st.session_state.get("footdle_player_df", get_players())
-        #player_names = sorted(player_df["Name"].tolist())
-        guessed_names = st.session_state.footdle_guesses
-        available_players = sorted([name for name in player_df["Name"].tolist() if name not in guessed_names])
-
-        col1, col2, col3, col4 = st.columns([4, 1, 1, 1])
-        with col1:
-            guess = st.selectbox(
-                "Type or pick a player's name:",
-                options=[""] + available_players,
-                key="footdle_select"
-            )
-        with col2:
-            st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
-            if st.button("Guess"):
-                # Don't allow guessing after giving up or after win
-                if guess and guess not in st.session_state.footdle_guesses and not st.session_state.footdle_gave_up_message and not st.session_state.footdle_win_message and st.session_state.footdle_started:
-                    st.session_state.footdle_guesses.append(guess)
+            if game is None:
+                st.stop()
+
+        players = get_player_index(player_df, game.version)
+
+        if not game.finished:
+            available_players = players.unguessed([engine.names[i] for i in game.guesses])
+            col1, col2, col3, col4 = st.columns([4, 1, 1, 1])
+            with col1:
+                guess = st.selectbox(
+                    "Type or pick a player's name:",
+                    options=[""] + available_players,
+                    key="footdle_select"
+                )
+            with col2:
+                st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
+                if st.button("Guess"):
+                    if guess and game.solo_turn(engine, players.position(guess)):
+                        if game.finished:
+                            end_game(game, player_df)
+                        st.rerun()
+            with col3:
+                st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
+                if st.button("Give Up"):
+                    if game.give_up():
+                        end_game(game, player_df)
+                    st.rerun()
+            with col4:
+                st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
+                if st.button("Restart"):
+                    end_game(game, player_df)  # logged unfinished, if guessed at all
+                    st.session_state.footdle_game = None
                     st.rerun()
-        with col3:
-            st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
-            if st.button("Give Up"):
-                st.session_state.footdle_gave_up_message = True
-                st.rerun()
-        with col4:
-            st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
-            if st.button("Restart"):
-                st.session_state.footdle_started = False
-                st.session_state.footdle_secret = None
-                st.session_state.footdle_guesses = []
-                st.session_state.footdle_gave_up_message = False
-                st.session_state.footdle_win_message = False
-                st.rerun()
 
-        secret = st.session_state.footdle_secret
+        secret_name = engine.names[game.secret]
 
         #message block
-        if st.session_state.footdle_gave_up_message:
-            answer = secret["Name"] if secret else "unknown"
+        if game.status == GAVE_UP:
+            answer = secret_name
             st.markdown(
                 f"""
                 <div style="display: flex; justify-content: center; margin-top: 20px;">
@@ -182,90 +343,14 @@ def footdle_page():
 
 
     
-        headers_html = """
-        <div style="display:grid;grid-template-columns:160px repeat(6, 120px);gap:18px;margin-bottom:2px;">
-            <div></div>
-            <div style="text-align:center;font-weight:bold;">POSITION</div>
-            <div style="text-align:center;font-weight:bold;">AGE</div>
-            <div style="text-align:center;font-weight:bold;">COUNTRY</div>
-            <div style="text-align:center;font-weight:bold;">CLUB</div>
-            <div style="text-align:center;font-weight:bold;">LEAGUE</div>
-            <div style="text-align:center;font-weight:bold;">VALUE (€ mil.) </div>
-        </div>
-        """
-        st.markdown(f"""<div style='display: flex; justify-content: center;'>{headers_html}</div>""", unsafe_allow_html=True)
-
-        # SVGs for arrows
-        arrow_up_svg = """
-        <svg width="28" height="28" style="vertical-align:middle;opacity:0.7;" viewBox="0 0 16 16"><path fill="black" d="M8 4l4 8H4z"/></svg>
-        """
-        arrow_down_svg = """
-        <svg width="28" height="28" style="vertical-align:middle;opacity:0.7;transform: rotate(180deg);" viewBox="0 0 16 16"><path fill="black" d="M8 4l4 8H4z"/></svg>
-        """
-
-        
-        win = False
-        for idx, guessed_name in enumerate(reversed(st.session_state.footdle_guesses)):
-            guess_row = player_df[player_df["Name"] == guessed_name].iloc[0]
-            correct = {
-                "Position": guess_row["Position"] == secret["Position"],
-                "Age": guess_row["Age"] == secret["Age"],
-                "Country": guess_row["Country"] == secret["Country"],
-                "Club": guess_row["Club"] == secret["Club"],
-                "League": guess_row["League"] == secret["League"],
-                "Market Value (€ mil.)": guess_row["Market Value (€ mil.)"] == secret["Market Value (€ mil.)"]
-            }
-            values = {
-                "Position": guess_row["Position"],
-                "Age": guess_row["Age"],
-                "Country": guess_row["Country"],
-                "Club": guess_row["Club"],
-                "League": guess_row["League"],
-                "Market Value (€ mil.)": guess_row["Market Value (€ mil.)"]
-            }
-            def get_bg(col):
-                return "#3dcc4a" if correct[col] else "#df2222"
-            def arrow_html(guess, real, correct):
-                if correct:
-                    return ""
-                try:
-                    guess = int(guess)
-                    real = int(real)
-                    if guess < real:
-                        return arrow_up_svg
-                    elif guess > real:
-                        return arrow_down_svg
-                except:
-                    pass
-                return ""
-            age_arrow = arrow_html(values["Age"], secret["Age"], correct["Age"])
-            mv_arrow = arrow_html(values["Market Value (€ mil.)"], secret["Market Value (€ mil.)"], correct["Market Value (€ mil.)"])
-            html = f"""
-            <div style="display:grid;grid-template-columns:160px repeat(6, 120px);gap:18px;align-items:center;margin-bottom:10px;">
-                <div style="font-weight:bold;font-size:1.1em;color:b2b8c2;letter-spacing:1px;">{guessed_name}</div>
-                <div style="border:6px solid black; background:{get_bg('Position')}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;font-size:2em;">{values['Position']}</div>
-                <div style="border:6px solid black; background:{get_bg('Age')}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;font-size:2em;position:relative;">
-                    <span>{values['Age']}</span>
-                    <span style="margin-left:8px;">{age_arrow}</span>
-                </div>
-                <div style="border:6px solid black; background:{get_bg('Country')}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;font-size:1.4em;">{values['Country']}</div>
-                <div style="border:6px solid black; background:{get_bg('Club')}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;white-space:normal;text-align:center;font-size:1.2em;">{values['Club']}</div>
-                <div style="border:6px solid black; background:{get_bg('League')}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;white-space:normal;text-align:center;font-size:1.2em;">{values['League']}</div>
-                <div style="border:6px solid black; background:{get_bg('Market Value (€ mil.)')}; border-radius:7px; height:90px;display:flex;align-items:center;justify-content:center;font-size:2em;position:relative;">
-                    <span>{values['Market Value (€ mil.)']}</span>
-                    <span style="margin-left:8px;">{mv_arrow}</span>
-                </div>
-            </div>
-            """
-            st.markdown(f"""<div style='display: flex; justify-content: center;'>{html}</div>""", unsafe_allow_html=True)
-
-            
-            if all(correct.values()) and not st.session_state.footdle_gave_up_message and st.session_state.footdle_started:
-                st.session_state.footdle_win_message = True
-                st.session_state.footdle_started = False
-                break
-
-        if st.session_state.get("footdle_win_message"):
+        with metrics.timed("grid_render", mode=game.mode):
+            rows = [SOLO_HEADER_HTML]
+            for guess_idx in reversed(game.guesses):
+                rows.append(solo_row_html(player_df, engine, game.version, guess_idx, game.secret))
+            metrics.count("cache_requests", len(game.guesses), cache="grid_row")
+        st.markdown(f"""<div style='display: flex; flex-direction: column; align-items: center;'>{"".join(rows)}</div>""", unsafe_allow_html=True)
+
+        if game.status == USER_WON:
             st.markdown(
                 f"""
                 <div style="display: flex; justify-content: center; margin-top: 20px;">
@@ -280,9 +365,9 @@ def footdle_page():
                             text-align: center;
                             letter-spacing: 0.01em;
                             box-shadow: 0 8px 32px rgba(0,0,0,0.13);">
-                    🎉 YOU WIN! The player was: <span style="color:#fff700">{secret['Name']}</span><br>
+                    🎉 YOU WIN! The player was: <span style="color:#fff700">{secret_name}</span><br>
                     <span style="font-size:0.85em; color:#eeeeee; font-weight:normal;">
-                        Try another round or check the player’s stats!
+                        {"See how you did on the Leaderboard page!" if daily else "Try another round or check the player’s stats!"}
                     </span>
                 </div>
                 """,
@@ -295,7 +380,7 @@ def footdle_page():
     elif st.session_state.footdle_mode == "Computer":
 
         # difficulty selector
-        if not st.session_state.get("footdle_started", False):
+        if game is None or game.finished:
             st.markdown("### 🤖 Select Difficulty")
 
             selected = st.select_slider(
@@ -325,34 +410,13 @@ def footdle_page():
             st.markdown("   ")
             st.markdown("   ")
 
-        if "footdle_started" not in st.session_state:
-            st.session_state.footdle_started = False
-        if "footdle_secret" not in st.session_state:
-            st.session_state.footdle_secret = None
-        if "footdle_guesses" not in st.session_state:
-            st.session_state.footdle_guesses = []
-        if "footdle_bot_possible" not in st.session_state:
-            st.session_state.footdle_bot_possible = None
-        if "footdle_bot_guesses" not in st.session_state:
-            st.session_state.footdle_bot_guesses = []
-        if "footdle_win_message" not in st.session_state:
-            st.session_state.footdle_win_message = None
-
-        if not st.session_state.footdle_started:
             col1, col2, col3 = st.columns([2.2, 1, 2])
             with col2:
                 if st.button("Start 1v1"):
-                    st.session_state.footdle_win_message = None
-                    player_df = get_players()
-                    st.session_state.footdle_player_df = player_df
-                    secret_row = player_df.sample(1).iloc[0]
-                    st.session_state.footdle_secret = secret_row.to_dict()
-                    st.session_state.footdle_guesses = []
-                    st.session_state.footdle_bot_possible = player_df.copy()
-                    st.session_state.footdle_bot_guesses = []
-                    st.session_state.footdle_started = True
+                    start_game("Computer", difficulty=st.session_state.get("footdle_difficulty", "Medium"))
                     st.rerun()
 
+        if game is None:
             st.markdown("---")
             st.markdown("### 🤖 Difficulty Levels Explained")
             st.markdown("""
@@ -362,7 +426,7 @@ def footdle_page():
             - 🟡 **Easy** – **50% noise**: Half of its guesses are wrong, even if it knows better.  
             - 🟠 **Medium** – **25% noise**: Decent logic, but still makes 1 in 4 guesses incorrectly.  
             - 🔴 **Hard** – **10% noise**: Very smart – only 1 in 10 guesses are contaminated.  
-            - ⚫ **Impossible** – **0% noise**: Perfect logic. The bot only guesses when it's certain.
+            - ⚫ **Impossible** – **0% noise**: Perfect logic. The bot uses every hint it has received and always picks the most informative player.
             """)
             st.markdown(
                 "<sub> *Note:* **Noise** means how often the bot includes misleading players in its guess pool, making it harder for it to win.</sub>",
@@ -377,113 +441,33 @@ def footdle_page():
 
 
         
-        player_df = st.session_state.footdle_player_df
-        player_names = sorted(player_df["Name"].tolist())
-        #guessed_names = st.session_state.footdle_guesses
-        #available_players = sorted([name for name in player_df["Name"].tolist() if name not in guessed_names])
-
-
-        col_drop, col_guess,col_restart = st.columns([4, 1, 1])
-        with col_drop:
-            guess = st.selectbox("Type or pick a player's name:", [""] + player_names, key="footdle_select_computer")
-
-
-        with col_guess:
-            st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
-            if st.button("Guess"):
-                st.session_state.footdle_win_message = None
-
-                if guess and guess not in st.session_state.footdle_guesses and not st.session_state.footdle_win_message and st.session_state.footdle_started:
-
-                    st.session_state.footdle_guesses.append(guess)
-                    secret = st.session_state.footdle_secret
-
-                    user_correct = guess == secret["Name"]
-                    bot_correct = False
-                    bot_guess = None
-
-                    difficulty = st.session_state.get("footdle_difficulty", "Medium")
-                    contamination_map = {
-                        "Noob": 100,
-                        "Easy": 50,
-                        "Medium": 25,
-                        "Hard": 10,
-                        "Impossible": 0
-                    }
-                    contam_percent = contamination_map.get(difficulty, 25)
-
-                    if difficulty == "Noob":
-                        all_unguessed = player_df[~player_df["Name"].isin(st.session_state.footdle_bot_guesses)]
-                        if not all_unguessed.empty:
-                            bot_guess_row = all_unguessed.sample(1).iloc[0]
-                            bot_guess = bot_guess_row["Name"]
-                            st.session_state.footdle_bot_guesses.append(bot_guess)
-                            bot_correct = bot_guess == secret["Name"]
-                    else:
-                        if st.session_state.footdle_bot_possible is None or len(st.session_state.footdle_bot_guesses) == 0:
-                            bot_possible = player_df.copy()
-                        else:
-                            bot_possible = st.session_state.footdle_bot_possible.copy()
-
-                        bot_possible = bot_possible[~bot_possible["Name"].isin(st.session_state.footdle_bot_guesses)]
-
-                        if len(st.session_state.footdle_bot_guesses) > 0:
-                            last_bot_guess_row = player_df[player_df["Name"] == st.session_state.footdle_bot_guesses[-1]].iloc[0]
-                            feedback = {
-                                "Position": last_bot_guess_row["Position"] == secret["Position"],
-                                "Age": last_bot_guess_row["Age"] == secret["Age"],
-                                "Country": last_bot_guess_row["Country"] == secret["Country"],
-                                "Club": last_bot_guess_row["Club"] == secret["Club"],
-                                "League": last_bot_guess_row["League"] == secret["League"],
-                                "Market Value (€ mil.)": last_bot_guess_row["Market Value (€ mil.)"] == secret["Market Value (€ mil.)"]
-                            }
-                            for col, is_correct in feedback.items():
-                                if is_correct:
-                                    bot_possible = bot_possible[bot_possible[col] == secret[col]]
-
-                        if contam_percent > 0:
-                            n_extra = max(1, int((contam_percent / 100) * len(bot_possible)))
-                            all_names = set(player_df["Name"])
-                            current_possible_names = set(bot_possible["Name"])
-                            already_guessed = set(st.session_state.footdle_bot_guesses)
-                            excluded_names = current_possible_names | already_guessed
-                            false_positives_df = player_df[~player_df["Name"].isin(excluded_names)]
-                            if not false_positives_df.empty:
-                                add_df = false_positives_df.sample(n=min(n_extra, len(false_positives_df)))
-                                bot_possible = pd.concat([bot_possible, add_df], ignore_index=True)
-
-                        bot_possible = bot_possible.drop_duplicates(subset="Name").reset_index(drop=True)
-                        if len(bot_possible) > 0:
-                            bot_guess_row = bot_possible.sample(1).iloc[0]
-                            bot_guess = bot_guess_row["Name"]
-                            st.session_state.footdle_bot_guesses.append(bot_guess)
-                            st.session_state.footdle_bot_possible = bot_possible
-                            bot_correct = bot_guess == secret["Name"]
-
-                    # === WIN OUTCOME CHECK ===
-                    if user_correct and bot_correct:
-                        st.session_state.footdle_win_message = "draw"
-                    elif user_correct:
-                        st.session_state.footdle_win_message = "user"
-                    elif bot_correct:
-                        st.session_state.footdle_win_message = "bot"
-
-                    if st.session_state.footdle_win_message:
-                        st.session_state.footdle_started = False
-
-        with col_restart:
-            st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
-            if st.button("Restart"):
-                st.session_state.footdle_started = False
-                st.session_state.footdle_secret = None
-                st.session_state.footdle_guesses = []
-                st.session_state.footdle_bot_guesses = []
-                st.session_state.footdle_bot_possible = None
-                st.session_state.footdle_win_message = None
-                st.rerun()
+        players = get_player_index(player_df, game.version)
+
+        if not game.finished:
+            col_drop, col_guess,col_restart = st.columns([4, 1, 1])
+            with col_drop:
+                guess = st.selectbox("Type or pick a player's name:", [""] + players.sorted_names, key="footdle_select_computer")
+
+            with col_guess:
+                st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
+                if st.button("Guess") and guess:
+                    tree = get_decision_tree(game.version) if game.difficulty == "Impossible" else None
+                    with metrics.timed("computer_turn", difficulty=game.difficulty):
+                        played = game.computer_turn(engine, players.position(guess), tree=tree)
+                    if played and game.finished:
+                        end_game(game, player_df)
+
+            with col_restart:
+                st.markdown("<div style='margin-top: 32px;'>", unsafe_allow_html=True)
+                if st.button("Restart"):
+                    end_game(game, player_df)  # logged unfinished, if guessed at all
+                    st.session_state.footdle_game = None
+                    st.rerun()
+
+        secret_name = engine.names[game.secret]
 
         # --- win/lose/draw message ---
-        if st.session_state.footdle_win_message == "user":
+        if game.status == USER_WON:
             st.markdown(
                 f"""
                 <div style="width:100%;
@@ -497,7 +481,7 @@ def footdle_page():
                             text-align: center;
                             letter-spacing: 0.01em;
                             box-shadow: 0 8px 32px rgba(0,0,0,0.13);">
-                    🎉 YOU WIN! The player was: <span style="color:#fff700">{st.session_state.footdle_secret['Name']}</span><br>
+                    🎉 YOU WIN! The player was: <span style="color:#fff700">{secret_name}</span><br>
                     <span style="font-size:0.85em; color:#eeeeee; font-weight:normal;">
                         Try another round or check the player’s stats!
                     </span>
@@ -505,7 +489,7 @@ def footdle_page():
                 """,
                 unsafe_allow_html=True
             )
-        elif st.session_state.footdle_win_message == "bot":
+        elif game.status == BOT_WON:
             st.markdown(
                 f"""
                 <div style="width:100%;
@@ -519,7 +503,7 @@ def footdle_page():
                             text-align: center;
                             letter-spacing: 0.01em;
                             box-shadow: 0 8px 32px rgba(0,0,0,0.13);">
-                    🤖 THE COMPUTER WINS! The player was: <span style="color:#fff700">{st.session_state.footdle_secret['Name']}</span><br>
+                    🤖 THE COMPUTER WINS! The player was: <span style="color:#fff700">{secret_name}</span><br>
                     <span style="font-size:0.85em; color:#eeeeee; font-weight:normal;">
                         Try again or try Solo mode!
                     </span>
@@ -527,7 +511,7 @@ def footdle_page():
                 """,
                 unsafe_allow_html=True
             )
-        elif st.session_state.footdle_win_message == "draw":
+        elif game.status == DRAW:
             st.markdown(
                 f"""
                 <div style="width:100%;
@@ -541,7 +525,7 @@ def footdle_page():
                             text-align: center;
                             letter-spacing: 0.01em;
                             box-shadow: 0 8px 32px rgba(0,0,0,0.13);">
-                    🤝 IT'S A DRAW! Both guessed: <span style="color:#fff700">{st.session_state.footdle_secret['Name']}</span><br>
+                    🤝 IT'S A DRAW! Both guessed: <span style="color:#fff700">{secret_name}</span><br>
                     <span style="font-size:0.85em; color:#eeeeee; font-weight:normal;">
                         That was intense. Want to go again?
                     </span>
@@ -557,81 +541,11 @@ def footdle_page():
         with colc:
             st.markdown("**Bot's Guess**")
 
-        for i in reversed(range(len(st.session_state.footdle_guesses))):
-            user_name = st.session_state.footdle_guesses[i]
-            user_row = player_df[player_df["Name"] == user_name].iloc[0]
-            secret = st.session_state.footdle_secret
-
-            correct = {
-                "Position": user_row["Position"] == secret["Position"],
-                "Age": user_row["Age"] == secret["Age"],
-                "Country": user_row["Country"] == secret["Country"],
-                "Club": user_row["Club"] == secret["Club"],
-                "League": user_row["League"] == secret["League"],
-                "Market Value (€ mil.)": user_row["Market Value (€ mil.)"] == secret["Market Value (€ mil.)"]
-            }
-            values = {
-                "Position": user_row["Position"],
-                "Age": user_row["Age"],
-                "Country": user_row["Country"],
-                "Club": user_row["Club"],
-                "League": user_row["League"],
-                "Market Value (€ mil.)": user_row["Market Value (€ mil.)"]
-            }
-            def get_bg(col): return "#3dcc4a" if correct[col] else "#df2222"
-
-            arrow_up_svg = """<svg width="18" height="18" style="vertical-align:middle;opacity:0.7;" viewBox="0 0 16 16"><path fill="black" d="M8 4l4 8H4z"/></svg>"""
-            arrow_down_svg = """<svg width="18" height="18" style="vertical-align:middle;opacity:0.7;transform: rotate(180deg);" viewBox="0 0 16 16"><path fill="black" d="M8 4l4 8H4z"/></svg>"""
-
-            def arrow_html(guess, real, correct):
-                if correct:
-                    return ""
-                try:
-                    guess = int(guess)
-                    real = int(real)
-                    if guess < real:
-                        return arrow_up_svg
-                    elif guess > real:
-                        return arrow_down_svg
-                except:
-                    pass
-                return ""
-
-            bot_guess_str = ""
-            if i < len(st.session_state.footdle_bot_guesses):
-                bot_name = st.session_state.footdle_bot_guesses[i]
-                bot_row = player_df[player_df["Name"] == bot_name].iloc[0]
-                correct_bot = [
-                    bot_row["Position"] == secret["Position"],
-                    bot_row["Age"] == secret["Age"],
-                    bot_row["Country"] == secret["Country"],
-                    bot_row["Club"] == secret["Club"],
-                    bot_row["League"] == secret["League"],
-                    bot_row["Market Value (€ mil.)"] == secret["Market Value (€ mil.)"]
-                ]
-                n_correct = sum(correct_bot)
-                bot_guess_str = f"<div style='font-weight:bold;color:#0078ff;padding-right:50px;font-size:1.1em;'>{bot_name} ({n_correct}/6)</div>"
-
-            html = f"""
-            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:4px;">
-            <div style="display:grid;grid-template-columns:120px repeat(6, 95px);gap:8px;align-items:center;">
-                <div style="font-weight:bold;font-size:1.1em;padding-right:8px;">{user_name}</div>
-                    <div style="border:4px solid black; background:{get_bg('Position')}; border-radius:7px; height:65px; display:flex; align-items:center; justify-content:center;text-align: center; font-size:1.2em;">
-                        {values['Position']}
-                        </div>
-                        <div style="border:4px solid black;background:{get_bg('Age')}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.2em;">
-                            <span>{values['Age']}</span>
-                            <span style="margin-left:6px;">{arrow_html(values['Age'], secret['Age'], correct['Age'])}</span>
-                        </div>
-                        <div style="border:4px solid black;background:{get_bg('Country')}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.1em;">{values['Country']}</div>
-                        <div style="border:4px solid black;background:{get_bg('Club')}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.1em;">{values['Club']}</div>
-                        <div style="border:4px solid black;background:{get_bg('League')}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.1em;">{values['League']}</div>
-                        <div style="border:4px solid black;background:{get_bg('Market Value (€ mil.)')}; border-radius:7px; height:65px;display:flex;align-items:center;justify-content:center;text-align: center;font-size:1.2em;">
-                        <span>{values['Market Value (€ mil.)']}</span>
-                        <span style="margin-left:6px;">{arrow_html(values['Market Value (€ mil.)'], secret['Market Value (€ mil.)'], correct['Market Value (€ mil.)'])}</span>
-                    </div>
-                    </div>
-                <div style="min-width:180px;margin-left:30px;text-align:right;">{bot_guess_str}</div>
-            </div>
-            """
-            st.markdown(f"""<div style='display: flex; justify-content: center;'>{html}</div>""", unsafe_allow_html=True)
+        with metrics.timed("grid_render", mode=game.mode):
+            rows = []
+            for i in reversed(range(len(game.guesses))):
+                bot_idx = game.bot_guesses[i] if i < len(game.bot_guesses) else -1
+                rows.append(computer_row_html(player_df, engine, game.version, game.guesses[i], bot_idx, game.secret))
+            metrics.count("cache_requests", len(rows), cache="grid_row")
+        if rows:
+            st.markdown(f"""<div style='display: flex; flex-direction: column; align-items: center;'>{"".join(rows)}</div>""", unsafe_allow_html=True)
@@ -0,0 +1,127 @@
+from packages import np, time
+from feedback import ALL_EQUAL
+from solver import BotState, bot_move
+
+# ----------------------------
+# Footdle game engine
+# ----------------------------
+# The game rules without Streamlit. A game is the dataset version plus row
+# indices into the shared player table (secret, user guesses, bot guesses)
+# and, against the computer, the bot's packed BotState, so it stays a few
+# hundred bytes per session and round-trips through JSON. Anything that
+# needs the player data takes the shared FeedbackEngine as an argument.
+# Every game has a seed: it draws the secret and, with the turn number,
+# the bot's randomness, so a game replays exactly from its seed, secret and
+# guesses (see replay.py).
+PLAYING = "playing"
+USER_WON = "user"
+BOT_WON = "bot"
+DRAW = "draw"
+GAVE_UP = "gave_up"
+
+class FootdleGame:
+    __slots__ = ("mode", "version", "seed", "secret", "guesses", "bot_guesses", "bot", "difficulty", "day", "status", "started", "times", "tree")
+
+    def __init__(self, mode, version, secret, seed=0, difficulty=None, day=None, bot=None, guesses=None, bot_guesses=None, status=PLAYING, started=None, times=None, tree=False):
+        self.mode = mode              # "Solo", "Daily" or "Computer"
+        self.version = version        # dataset version the indices refer to
+        self.seed = int(seed)
+        self.secret = int(secret)
+        self.difficulty = difficulty  # Computer mode only
+        self.day = day                # Daily mode only
+        self.bot = bot
+        self.guesses = guesses or []
+        self.bot_guesses = bot_guesses or []
+        self.status = status
+        self.started = started if started is not None else time.time()
+        self.times = times or []      # ms from the start to each guess
+        self.tree = tree              # the bot was given the precomputed decision tree
+
+    @classmethod
+    def start(cls, engine, version, mode, seed=None, secret=None, difficulty=None, day=None):
+        # a fresh seed unless one is given; the secret comes from the seed
+        # unless one is given (the daily puzzle)
+        if seed is None:
+            seed = np.random.SeedSequence().entropy % 2**63
+        if secret is None:
+            secret = np.random.default_rng(seed).integers(engine.n)
+        bot = BotState(engine.n) if mode == "Computer" else None
+        return cls(mode, version, secret, seed=seed, difficulty=difficulty, day=day, bot=bot)
+
+    def turn_rng(self):
+        # the bot's randomness for the current turn, reproducible from the seed
+        return np.random.default_rng([self.seed, len(self.guesses)])
+
+    def _guessed(self, guess):
+        self.guesses.append(int(guess))
+        self.times.append(int((time.time() - self.started) * 1000))
+
+    @property
+    def finished(self):
+        return self.status != PLAYING
+
+    def can_guess(self, guess):
+        return not self.finished and guess not in self.guesses
+
+    def solo_turn(self, engine, guess):
+        # Solo / Daily: returns False when the guess is not allowed
+        if not self.can_guess(guess):
+            return False
+        self._guessed(guess)
+        if engine.feedback(guess, self.secret) == ALL_EQUAL:
+            self.status = USER_WON
+        return True
+
+    def computer_turn(self, engine, guess, rng=None, tree=None):
+        # the user's guess, then the bot's reply; both can win on the same turn
+        if not self.can_guess(guess):
+            return False
+        rng = rng or self.turn_rng()
+        self._guessed(guess)
+        if tree is not None:
+            self.tree = True
+        secret_name = engine.names[self.secret]
+        user_correct = engine.names[guess] == secret_name
+        bot_correct = False
+        bot_guess = bot_move(engine, self.bot, self.secret, self.difficulty, rng, tree=tree)
+        if bot_guess is not None:
+            self.bot_guesses.append(bot_guess)
+            bot_correct = engine.names[bot_guess] == secret_name
+
+        if user_correct and bot_correct:
+            self.status = DRAW
+        elif user_correct:
+            self.status = USER_WON
+        elif bot_correct:
+            self.status = BOT_WON
+        return True
+
+    def give_up(self):
+        if self.finished:
+            return False
+        self.status = GAVE_UP
+        return True
+
+    def to_dict(self):
+        return {
+            "mode": self.mode,
+            "version": self.version,
+            "seed": self.seed,
+            "secret": self.secret,
+            "difficulty": self.difficulty,
+            "day": self.day,
+            "bot": self.bot.to_dict() if self.bot is not None else None,
+            "guesses": list(self.guesses),
+            "bot_guesses": list(self.bot_guesses),
+            "status": self.status,
+            "started": self.started,
+            "times": list(self.times),
+            "tree": self.tree,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        if data.get("bot") is not None:
+            data["bot"] = BotState.from_dict(data["bot"])
+        return cls(**data)
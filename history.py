@@ -0,0 +1,128 @@
+from packages import pd, pa, pq, ds, os, threading, time, datetime, timezone
+from snapshot import DATA_DIR
+import metrics
+
+# ----------------------------
+# Market value history
+# ----------------------------
+# Every published snapshot is appended to a Parquet dataset partitioned by
+# UTC date (history/date=YYYY-MM-DD/part-*.parquet). Only rows that differ
+# from the player's last recorded value or club are written, so a year of
+# hourly scrapes stores roughly one row per actual change. The last state
+# per player is kept in latest.parquet to dedupe without reading history,
+# and past days are compacted into a single file each.
+HISTORY_DIR = os.path.join(DATA_DIR, "history")
+SCHEMA = pa.schema([
+    ("snapshot_at", pa.timestamp("s", tz="UTC")),
+    ("name", pa.dictionary(pa.int32(), pa.string())),
+    ("market_value", pa.float64()),
+    ("club", pa.dictionary(pa.int32(), pa.string())),
+])
+
+def day_of(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).date().isoformat()
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_DIR):
+        self.path = path
+        self.latest_path = os.path.join(path, "latest.parquet")
+        self.lock = threading.Lock()
+        self._latest = None   # name -> (market_value, club), loaded on first append
+        self._table = None    # full history as a DataFrame, loaded on first query
+
+    # ---- writing ----
+    def _load_latest(self):
+        if self._latest is None:
+            self._latest = {}
+            if os.path.exists(self.latest_path):
+                latest = pq.read_table(self.latest_path).to_pydict()  # nulls stay None
+                self._latest = dict(zip(latest["name"], zip(latest["market_value"], latest["club"])))
+        return self._latest
+
+    def append(self, df, saved_at=None):
+        # returns the number of changed rows written
+        saved_at = int(saved_at or time.time())
+        with self.lock, metrics.timed("history_append"):
+            latest = self._load_latest()
+            rows = []
+            for name, value, club in zip(df["Name"], df["Market Value (€ mil.)"], df["Club"]):
+                value = None if pd.isna(value) else float(value)
+                if latest.get(name) != (value, club):
+                    rows.append((name, value, club))
+                    latest[name] = (value, club)
+            if not rows:
+                return 0
+            changes = pd.DataFrame(rows, columns=["name", "market_value", "club"])
+            changes.insert(0, "snapshot_at", pd.Timestamp(saved_at, unit="s", tz="UTC"))
+            partition = os.path.join(self.path, f"date={day_of(saved_at)}")
+            os.makedirs(partition, exist_ok=True)
+            self._write(pa.Table.from_pandas(changes, schema=SCHEMA, preserve_index=False), os.path.join(partition, f"part-{saved_at}.parquet"))
+            names, values = zip(*latest.items())
+            self._write(pa.table({
+                "name": list(names),
+                "market_value": [value for value, _ in values],
+                "club": [club for _, club in values],
+            }), self.latest_path)
+            if self._table is not None:
+                self._table = pd.concat([self._table, changes], ignore_index=True)
+            self._compact(exclude=day_of(saved_at))
+            return len(rows)
+
+    def _write(self, table, path):
+        # dot-prefixed temp file: dataset scans skip it
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)  # readers never see a partial file
+
+    def _compact(self, exclude):
+        # past days are finished: merge their hourly parts into one file
+        for entry in os.listdir(self.path):
+            partition = os.path.join(self.path, entry)
+            if not entry.startswith("date=") or entry == f"date={exclude}":
+                continue
+            parts = sorted(name for name in os.listdir(partition) if name.endswith(".parquet"))
+            if len(parts) <= 1:
+                continue
+            table = pa.concat_tables([pq.read_table(os.path.join(partition, name), schema=SCHEMA) for name in parts])
+            self._write(table, os.path.join(partition, "day.parquet"))
+            for name in parts:
+                if name != "day.parquet":
+                    os.remove(os.path.join(partition, name))
+
+    # ---- queries ----
+    def table(self):
+        with self.lock:
+            if self._table is None:
+                table = SCHEMA.empty_table()
+                if os.path.isdir(self.path):
+                    dataset = ds.dataset(self.path, format="parquet", schema=SCHEMA, partitioning="hive", ignore_prefixes=[".", "latest"])
+                    table = dataset.to_table()
+                self._table = table.to_pandas().sort_values("snapshot_at", kind="stable", ignore_index=True)
+            return self._table
+
+    def value_history(self, name):
+        # one row per recorded change: snapshot_at, market_value, club
+        history = self.table()
+        return history.loc[history["name"] == name, ["snapshot_at", "market_value", "club"]].reset_index(drop=True)
+
+    def biggest_movers(self, days=7, limit=10):
+        # players whose value changed most between `days` ago and now
+        history = self.table()
+        if history.empty:
+            return pd.DataFrame(columns=["name", "before", "now", "change", "change_pct"])
+        cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=days)
+        moved = history.loc[history["snapshot_at"] >= cutoff, "name"].unique()
+        if not len(moved):
+            return pd.DataFrame(columns=["name", "before", "now", "change", "change_pct"])
+        rows = history[history["name"].isin(moved)]
+        # the last value before the window, or the first one inside it for
+        # players first recorded after the cutoff
+        before = rows[rows["snapshot_at"] < cutoff].groupby("name", observed=True)["market_value"].last()
+        first = rows.groupby("name", observed=True)["market_value"].first()
+        now = rows.groupby("name", observed=True)["market_value"].last()
+        movers = pd.DataFrame({"before": before.reindex(now.index).fillna(first), "now": now})
+        movers["change"] = movers["now"] - movers["before"]
+        movers["change_pct"] = movers["change"] / movers["before"] * 100
+        movers = movers[movers["change"] != 0]
+        movers = movers.reindex(movers["change"].abs().sort_values(ascending=False).index)
+        return movers.head(limit).rename_axis("name").reset_index()
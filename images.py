@@ -0,0 +1,131 @@
+from packages import requests, HTTPAdapter, ThreadPoolExecutor, os, threading, time
+from snapshot import DATA_DIR
+from kvstore import KeyValueStore
+import metrics
+
+# ----------------------------
+# Persistent player image store
+# ----------------------------
+IMAGES_PATH = os.path.join(DATA_DIR, "images.sqlite")
+WIKIPEDIA_API = os.environ.get("FOOTDLE_WIKIPEDIA_API", "https://en.wikipedia.org/w/api.php")
+IMAGE_TTL = 30 * 24 * 3600       # found images are kept for a month
+FAILURE_BACKOFF = 5 * 60         # lookups that failed on the network are retried after five minutes
+IMAGE_WORKERS = 8                # concurrent lookups of the bulk resolver
+IMAGE_TIMEOUT = 5                # seconds per lookup
+THUMB_SIZE = 220                 # same width as the Player Info photo
+
+class ImageStore(KeyValueStore):
+    # name -> image URL, None meaning "looked up, no image"
+    def __init__(self, path=IMAGES_PATH):
+        super().__init__(path, ttl=IMAGE_TTL)
+
+# ----------------------------
+# Resolution: one API call per player
+# ----------------------------
+def resolve_image(name, session=None, timeout=IMAGE_TIMEOUT):
+    # search + lead image in a single MediaWiki query instead of
+    # search -> page info -> article download -> infobox parse
+    session = session or requests
+    params = {
+        "action": "query",
+        "format": "json",
+        "generator": "search",
+        "gsrsearch": name,
+        "gsrlimit": 1,
+        "prop": "pageimages",
+        "piprop": "thumbnail",
+        "pithumbsize": THUMB_SIZE,
+    }
+    try:
+        with metrics.timed("http_request", site="wikipedia"):
+            res = session.get(WIKIPEDIA_API, params=params, timeout=timeout)
+    except Exception:
+        metrics.count("http_requests", site="wikipedia", status="error")
+        raise
+    metrics.count("http_requests", site="wikipedia", status=res.status_code)
+    res.raise_for_status()
+    pages = res.json().get("query", {}).get("pages", {})
+    for page in pages.values():
+        thumbnail = page.get("thumbnail")
+        if thumbnail:
+            return thumbnail["source"]
+    return None
+
+class ImageResolver:
+    def __init__(self, store, max_workers=IMAGE_WORKERS):
+        self.store = store
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": "Mozilla/5.0"})
+        self.lock = threading.Lock()
+        self.running = False
+        self.failed = {}  # name -> when its lookup last failed, kept in memory only
+
+    def _resolve(self, name):
+        try:
+            url = resolve_image(name, self.session)
+        except Exception:
+            self.failed[name] = time.monotonic()
+            return name, False  # network error, not a negative result
+        self.failed.pop(name, None)
+        return name, url
+
+    def backing_off(self, name):
+        failed_at = self.failed.get(name)
+        return failed_at is not None and time.monotonic() - failed_at < FAILURE_BACKOFF
+
+    def missing(self, names):
+        # names to look up: neither stored nor failed a moment ago
+        return [name for name in dict.fromkeys(names) if not self.store.lookup(name)[0] and not self.backing_off(name)]
+
+    def get(self, name):
+        known, cached = self.store.lookup(name)
+        metrics.count("cache_requests", cache="images")
+        if known or self.backing_off(name):
+            return cached
+        metrics.count("cache_misses", cache="images")
+        name, url = self._resolve(name)
+        if url is False:
+            return cached  # keep serving an expired entry while the API is unreachable
+        self.store.save({name: url})
+        return url
+
+    def resolve_all(self, names, max_workers=None, progress=None):
+        # one bulk pass at a time; progress(done, total) after every lookup
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+        try:
+            names = list(dict.fromkeys(names))
+            missing = self.missing(names)
+            done = len(names) - len(missing)
+            if progress:
+                progress(done, len(names))
+            results = {}
+            with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as pool:
+                for name, url in pool.map(self._resolve, missing):
+                    if url is not False:
+                        results[name] = url
+                    if len(results) >= 25:  # save in batches so progress survives a restart
+                        self.store.save(results)
+                        results = {}
+                    done += 1
+                    if progress:
+                        progress(done, len(names))
+            if results:
+                self.store.save(results)
+        finally:
+            with self.lock:
+                self.running = False
+
+    def resolve_in_background(self, names):
+        with self.lock:
+            if self.running:
+                return
+        if not self.missing(names):
+            return  # everything stored or backing off: no thread per rerun
+        threading.Thread(target=self.resolve_all, args=(names,), daemon=True).start()
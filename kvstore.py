@@ -0,0 +1,61 @@
+from packages import os, sqlite3, threading, time, json
+
+# ----------------------------
+# Small persistent key/value store
+# ----------------------------
+# key -> JSON value and the time it was saved, in one SQLite table and
+# mirrored in memory so reads never touch the disk. The image, club and
+# listing caches are built on it. A value of None means "looked up,
+# nothing found" and expires after missing_ttl instead of ttl.
+MISSING_TTL = 24 * 3600  # keys looked up without a result are retried after a day
+
+class KeyValueStore:
+    def __init__(self, path, ttl=None, missing_ttl=MISSING_TTL):
+        self.path = path
+        self.ttl = ttl  # None: entries never expire
+        self.missing_ttl = missing_ttl
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT, saved_at REAL)")
+            conn.commit()
+            self.entries = {key: (self.decode(json.loads(value)), at) for key, value, at in conn.execute("SELECT key, value, saved_at FROM entries")}
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def decode(self, value):
+        # the stored JSON back to what was saved, for values that are not plain JSON
+        return value
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        return entry[0] if entry else None
+
+    def lookup(self, key):
+        # returns (known, value); an expired entry is not known but still returned
+        entry = self.entries.get(key)
+        if entry is None:
+            return False, None
+        value, saved_at = entry
+        ttl = self.ttl if value is not None else self.missing_ttl
+        if ttl is not None and time.time() - saved_at > ttl:
+            return False, value
+        return True, value
+
+    def save(self, items):
+        # items: key -> value
+        now = time.time()
+        rows = [(key, json.dumps(value), now) for key, value in items.items()]
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", rows)
+                conn.commit()
+            finally:
+                conn.close()
+            for key, value in items.items():
+                self.entries[key] = (value, now)
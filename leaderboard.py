@@ -0,0 +1,31 @@
+from packages import st, pd, px
+from daily import today, get_leaderboard
+
+def show_leaderboard_page():
+    day = today()
+    st.title(f"🏆 Daily Leaderboard – {day}")
+    board = get_leaderboard(day)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Players today", board["players"])
+    col2.metric("Solved", f"{board['wins'] / board['players']:.0%}" if board["players"] else "–")
+    col3.metric("Average guesses", f"{board['mean_guesses']:.2f}" if board["mean_guesses"] else "–")
+
+    if not board["top"]:
+        st.markdown("Nobody has solved today's puzzle yet. Be the first in **FootDle → Daily**!")
+        return
+
+    st.markdown("### 🥇 Fewest guesses")
+    top = pd.DataFrame(board["top"], columns=["Player", "Guesses"])
+    top.index = range(1, len(top) + 1)
+    st.dataframe(top, use_container_width=True)
+
+    histogram = pd.DataFrame(board["histogram"], columns=["Guesses", "Players"])
+    fig_guesses = px.bar(
+        histogram,
+        x="Guesses",
+        y="Players",
+        title="Guess Distribution",
+        color_discrete_sequence=["#1be7b7"]
+    )
+    st.plotly_chart(fig_guesses, use_container_width=True)
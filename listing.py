@@ -0,0 +1,34 @@
+from packages import os
+from snapshot import DATA_DIR
+from kvstore import KeyValueStore
+
+# ----------------------------
+# Listing page cache
+# ----------------------------
+# What was last seen on each listing page: the validators the server sent
+# (ETag / Last-Modified), a hash of the body and the rows parsed from it
+# as (player key, club link, record). The next scrape asks for each page
+# conditionally; a 304 or a body with the same hash reuses the stored rows
+# instead of parsing the page again.
+LISTING_PATH = os.path.join(DATA_DIR, "listing.sqlite")
+
+class ListingCache(KeyValueStore):
+    # url -> (etag, last_modified, digest, rows), kept until replaced
+    def __init__(self, path=LISTING_PATH):
+        super().__init__(path)
+
+    def decode(self, value):
+        etag, last_modified, digest, rows = value
+        return etag, last_modified, digest, [(key, tuple(club) if club else None, tuple(record)) for key, club, record in rows]
+
+    def conditional_headers(self, url):
+        entry = self.get(url)
+        if entry is None:
+            return {}
+        etag, last_modified, _, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import json
+import logging
+import pickle
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import contextmanager
+
+from packages import os
+from fixtures import FixtureServer
+
+# Load test for projekt.py. Starts the app with `streamlit run` against the
+# fixture server and connects simulated users to it over the same websocket
+# protocol the browser speaks (BackMsg / ForwardMsg protobufs). Every user
+# walks Home -> Player Info -> FootDle Solo -> FootDle Computer -> Players
+# List, and all users of a level click at the same time, e.g.
+#   python loadtest.py --sessions 1 4 16 64 --journeys 2
+# so their reruns really contend for the server's one GIL, its locks, the
+# SQLite stores and the shared cache builds. Latency is measured per click,
+# from sending it to the end of the script run it starts (st.rerun
+# included); reruns/s is clicks served per second by the whole server and
+# cpu % the server's CPU time over the level's wall time (Linux only).
+# Memory per session is the pickled session state of one AppTest session
+# that walks the same journey; everything else is shared between sessions.
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "projekt.py")
+SERVER_START_TIMEOUT = 60  # seconds for `streamlit run` to answer its health check
+IDLE_TIMEOUT = 60          # seconds to wait for the server's background warm-up to finish
+GUESS_LABEL = "Type or pick a player's name:"
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000 if values else 0.0
+
+# ----------------------------
+# The user journey
+# ----------------------------
+# A generator of page interactions, shared by the websocket clients and the
+# AppTest session: it yields ("load",), ("click", label), ("select", label,
+# option) or ("guess", label, option) and is sent back the Page it led to.
+class Page:
+    def __init__(self, buttons, selects, errors):
+        self.buttons = buttons  # label -> widget id
+        self.selects = selects  # label -> (widget id, options)
+        self.errors = errors    # exceptions shown on the page
+
+def play(page, rng, guesses):
+    for _ in range(guesses):
+        if "Guess" not in page.buttons:
+            break  # game over
+        _, options = page.selects[GUESS_LABEL]
+        page = yield ("guess", GUESS_LABEL, rng.choice([name for name in options if name]))
+    return page
+
+def journey(rng, guesses):
+    yield ("load",)
+    page = yield ("click", "👤 Player Info")
+    _, options = page.selects["Choose a player:"]
+    yield ("select", "Choose a player:", rng.choice(options))
+    yield ("click", "⚽ FootDle")
+    yield ("click", "Solo")
+    page = yield ("click", "Start")
+    yield from play(page, rng, guesses)
+    yield ("click", "⬅ Back to mode select")
+    yield ("click", "Against Computer")
+    page = yield ("click", "Start 1v1")
+    yield from play(page, rng, guesses)
+    yield ("click", "⬅ Back to mode select")
+    yield ("click", "📋 Players List")
+
+# ----------------------------
+# Websocket client (one per simulated user)
+# ----------------------------
+class Client:
+    def __init__(self, url, seed, timeout):
+        self.url = url
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.ws = None
+        self.page = None
+        self.values = {}  # widget id -> WidgetState the user has set, sent with every rerun
+        self.errors = 0
+
+    async def connect(self):
+        import websockets
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None, open_timeout=self.timeout, compression=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, trigger=None):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(self.values.values())
+        if trigger is not None:
+            msg.rerun_script.widget_states.widgets.append(WidgetState(id=trigger, trigger_value=True))
+        await self.ws.send(msg.SerializeToString())
+        elements = {}
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await self.ws.recv())
+            kind = reply.WhichOneof("type")
+            if kind == "new_session":
+                elements = {}  # a new script run (st.rerun) redraws the page
+            elif kind == "delta" and reply.delta.WhichOneof("type") == "new_element":
+                elements[tuple(reply.metadata.delta_path)] = reply.delta.new_element
+            elif kind == "script_finished" and reply.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        buttons, selects, errors = {}, {}, 0
+        for element in elements.values():
+            kind = element.WhichOneof("type")
+            if kind == "button":
+                buttons[element.button.label] = element.button.id
+            elif kind == "selectbox":
+                selects[element.selectbox.label] = (element.selectbox.id, list(element.selectbox.options))
+            elif kind == "exception":
+                errors += 1
+        self.errors += errors
+        return Page(buttons, selects, errors)
+
+    async def act(self, action):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        kind, *args = action
+        trigger = None
+        if kind == "click":
+            trigger = self.page.buttons[args[0]]
+        elif kind in ("select", "guess"):
+            widget_id, _ = self.page.selects[args[0]]
+            self.values[widget_id] = WidgetState(id=widget_id, string_value=args[1])
+            if kind == "guess":
+                trigger = self.page.buttons["Guess"]
+        self.page = await asyncio.wait_for(self.rerun(trigger), self.timeout)
+        return self.page
+
+    async def walk(self, journeys, guesses, latencies):
+        for _ in range(journeys):
+            steps = journey(self.rng, guesses)
+            page = None
+            try:
+                while True:
+                    action = steps.send(page)
+                    start = time.perf_counter()
+                    page = await self.act(action)
+                    latencies.append(time.perf_counter() - start)
+            except StopIteration:
+                pass
+
+async def run_clients(url, n_sessions, journeys, guesses, timeout, seed):
+    clients = [Client(url, seed * 1_000_003 + i, timeout) for i in range(n_sessions)]
+    latencies = []
+    try:
+        await asyncio.gather(*(client.connect() for client in clients))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client.walk(journeys, guesses, latencies) for client in clients), return_exceptions=True)
+        wall = time.perf_counter() - start
+    finally:
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+    # a stalled or broken page ends that session
+    failures = [repr(result) for result in results if isinstance(result, BaseException)]
+    return latencies, wall, sum(client.errors for client in clients), failures
+
+def run_level(url, n_sessions, journeys, guesses, timeout, seed):
+    latencies, wall, errors, failures = asyncio.run(run_clients(url, n_sessions, journeys, guesses, timeout, seed))
+    return {
+        "sessions": n_sessions,
+        "reruns": len(latencies),
+        "errors": errors + len(failures),
+        "wall_s": wall,
+        "reruns_per_s": len(latencies) / wall,
+        "rerun_p50_ms": percentile(latencies, 0.5),
+        "rerun_p99_ms": percentile(latencies, 0.99),
+        "rerun_max_ms": percentile(latencies, 1.0),
+        "failures": failures[:5],
+    }
+
+# ----------------------------
+# Memory per session: one AppTest session's state after the journey
+# ----------------------------
+def apptest_page(at):
+    buttons = {button.label: None for button in at.button}
+    selects = {box.label: (None, list(box.options)) for box in at.selectbox}
+    return Page(buttons, selects, len(at.exception))
+
+def apptest_act(at, action):
+    kind, *args = action
+    if kind == "click":
+        next(button for button in at.button if button.label == args[0]).click()
+    elif kind in ("select", "guess"):
+        next(box for box in at.selectbox if box.label == args[0]).set_value(args[1])
+        if kind == "guess":
+            next(button for button in at.button if button.label == "Guess").click()
+    at.run()
+    return apptest_page(at)
+
+def state_bytes(guesses, timeout, seed):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    steps = journey(random.Random(seed), guesses)
+    page = None
+    try:
+        while True:
+            page = apptest_act(at, steps.send(page))
+    except StopIteration:
+        pass
+    state = at.session_state
+    return len(pickle.dumps({key: state[key] for key in state}))
+
+# ----------------------------
+# The app under test
+# ----------------------------
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def cpu_seconds(pid):
+    # user + system CPU time of a process (Linux), None elsewhere
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except OSError:
+        return None
+
+def wait_idle(pid, timeout=IDLE_TIMEOUT):
+    # until the server's background warm-up stops using CPU
+    deadline = time.monotonic() + timeout
+    used = cpu_seconds(pid)
+    while used is not None and time.monotonic() < deadline:
+        time.sleep(1.0)
+        now = cpu_seconds(pid)
+        if now - used < 0.05:
+            return
+        used = now
+
+@contextmanager
+def app_server(env, log_path):
+    port = free_port()
+    with open(log_path, "w") as log:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless=true", "--server.address=127.0.0.1",
+             f"--server.port={port}", "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+            env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+    try:
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).close()
+                break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"streamlit did not start, see {log_path}")
+                time.sleep(0.2)
+        yield proc, f"ws://127.0.0.1:{port}/_stcore/stream"
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit app")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16], help="concurrent session counts to try")
+    parser.add_argument("--journeys", type=int, default=1, help="full page walks per session")
+    parser.add_argument("--guesses", type=int, default=3, help="guesses per Footdle game")
+    parser.add_argument("--delay", type=float, default=0.0, help="simulated latency per fixture request (s)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds before a rerun counts as stalled")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # keep Streamlit's warnings out of the report
+    with FixtureServer(delay=args.delay) as server, tempfile.TemporaryDirectory() as data_dir:
+        # the app reads these when its modules are first imported
+        env = dict(os.environ, FOOTDLE_TRANSFERMARKT_URL=server.listing_url,
+                   FOOTDLE_WIKIPEDIA_API=server.wikipedia_api_url, FOOTDLE_DATA_DIR=data_dir)
+        os.environ.update(env)  # same data for the AppTest session
+        with app_server(env, os.path.join(data_dir, "streamlit.log")) as (proc, url):
+            run_level(url, 1, 1, args.guesses, args.timeout, args.seed)  # warm-up: snapshot, caches, imports
+            wait_idle(proc.pid)
+
+            results = []
+            print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'reruns/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'cpu %':>6}")
+            for n in args.sessions:
+                used = cpu_seconds(proc.pid)
+                result = run_level(url, n, args.journeys, args.guesses, args.timeout, args.seed)
+                result["server_cpu_pct"] = None if used is None else 100 * (cpu_seconds(proc.pid) - used) / result["wall_s"]
+                results.append(result)
+                cpu = "-" if result["server_cpu_pct"] is None else f"{result['server_cpu_pct']:.0f}"
+                print(f"{n:8d} {result['reruns']:7d} {result['errors']:6d} {result['reruns_per_s']:9.1f} "
+                      f"{result['rerun_p50_ms']:8.1f} {result['rerun_p99_ms']:8.1f} {result['rerun_max_ms']:8.1f} {cpu:>6}")
+                for failure in result["failures"]:
+                    print(f"  FAILED {failure}")
+        size = state_bytes(args.guesses, args.timeout, args.seed)
+        print(f"session state: {size} bytes per session")
+        for result in results:
+            result["state_bytes_per_session"] = size
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+    if any(result["errors"] for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
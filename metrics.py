@@ -0,0 +1,135 @@
+from packages import os, threading, time, bisect, contextmanager
+
+# ----------------------------
+# In-process metrics
+# ----------------------------
+# Counters and latency histograms shared by every session of the server
+# process. Hot paths call count() / observe() or wrap a block in
+# timed(); the admin panel shows them and they export in the Prometheus
+# text format, on demand or every METRICS_INTERVAL seconds to
+# FOOTDLE_METRICS_FILE (for node_exporter's textfile collector).
+PREFIX = "footdle_"
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_FILE = os.environ.get("FOOTDLE_METRICS_FILE")
+METRICS_INTERVAL = 15  # seconds between file exports
+
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> value
+_histograms = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def count(name, value=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, seconds, **labels):
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * (len(BUCKETS) + 2)
+        hist[bisect.bisect_left(BUCKETS, seconds)] += 1
+        hist[-1] += seconds
+
+@contextmanager
+def timed(name, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+def _quantile(hist, q):
+    # upper bound of the bucket holding the q-th observation
+    total = sum(hist[:-1])
+    if not total:
+        return 0.0
+    seen = 0
+    for bound, n in zip(BUCKETS + (float("inf"),), hist[:-1]):
+        seen += n
+        if seen >= q * total:
+            return bound
+    return float("inf")
+
+def summary():
+    # rows for the admin panel: one per counter, one per timer
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: list(hist) for key, hist in _histograms.items()}
+    label = lambda labels: ",".join(f"{k}={v}" for k, v in labels)
+    timers = [{
+        "metric": name,
+        "labels": label(labels),
+        "count": sum(hist[:-1]),
+        "mean_ms": hist[-1] / max(1, sum(hist[:-1])) * 1000,
+        "p50_ms": _quantile(hist, 0.5) * 1000,
+        "p99_ms": _quantile(hist, 0.99) * 1000,
+        "total_s": hist[-1],
+    } for (name, labels), hist in sorted(histograms.items())]
+    counts = [{"metric": name, "labels": label(labels), "value": value} for (name, labels), value in sorted(counters.items())]
+    return timers, counts
+
+def prometheus_text():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: list(hist) for key, hist in _histograms.items()}
+
+    def fmt(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+    lines = []
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE {PREFIX}{name}_total counter")
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f"{PREFIX}{name}_total{fmt(labels)} {value}")
+    for name in sorted({name for name, _ in histograms}):
+        lines.append(f"# TYPE {PREFIX}{name}_seconds histogram")
+        for (metric, labels), hist in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), hist[:-1]):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{PREFIX}{name}_seconds_bucket{fmt(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{PREFIX}{name}_seconds_sum{fmt(labels)} {hist[-1]}")
+            lines.append(f"{PREFIX}{name}_seconds_count{fmt(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+def write_metrics(path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)  # scrapers never read a half-written file
+
+_exporter = None
+
+def start_exporter(path=METRICS_FILE, interval=METRICS_INTERVAL):
+    # periodic file export, once per process; a no-op without a path
+    global _exporter
+    with _lock:
+        if not path or _exporter is not None:
+            return
+        _exporter = threading.Thread(target=_export_loop, args=(path, interval), daemon=True)
+    _exporter.start()
+
+def _export_loop(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_metrics(path)
+        except OSError:
+            pass  # keep exporting once the path is writable again
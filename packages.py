@@ -1,14 +1,58 @@
 
-import requests
-import pandas as pd
-from datetime import datetime
-import plotly.express as px
-from dateutil import parser
+import importlib
+from datetime import datetime, timezone
 import re
-from bs4 import BeautifulSoup
-import streamlit as st
-import wikipedia
 import warnings as warnings
 import time
-import numpy as np
-import plotly.express as px
\ No newline at end of file
+import os
+import gc
+import logging
+import sqlite3
+import threading
+import hashlib
+import json
+import uuid
+import bisect
+import random
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from urllib.parse import urljoin, urlsplit
+
+# Heavy third-party modules are imported on first use, so `from packages
+# import pd` only pays for pandas in the modules (and pages) that need it.
+LAZY = {
+    "requests": ("requests", None),
+    "HTTPAdapter": ("requests.adapters", "HTTPAdapter"),
+    "pd": ("pandas", None),
+    "px": ("plotly.express", None),
+    "parser": ("dateutil.parser", None),
+    "BeautifulSoup": ("bs4", "BeautifulSoup"),
+    "SoupStrainer": ("bs4", "SoupStrainer"),
+    "st": ("streamlit", None),
+    "wikipedia": ("wikipedia", None),
+    "np": ("numpy", None),
+    "pa": ("pyarrow", None),
+    "pq": ("pyarrow.parquet", None),
+    "ds": ("pyarrow.dataset", None),
+}
+
+def html_parser():
+    try:
+        import lxml  # faster parser backend, optional
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+def __getattr__(name):
+    if name == "HTML_PARSER":
+        value = html_parser()
+    elif name in LAZY:
+        module, attr = LAZY[name]
+        value = importlib.import_module(module)
+        if attr:
+            value = getattr(value, attr)
+    else:
+        raise AttributeError(f"module 'packages' has no attribute {name!r}")
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
@@ -1,15 +1,27 @@
 from packages import st, pd, px
-from scrape import get_players
+from scrape import get_player_snapshot
 
-def show_players_page():
-    st.title("Top 100 Most Valuable Players")
-    df = get_players()
-    st.dataframe(df, hide_index=True)
+# ----------------------------
+# Aggregates and figures (once per dataset version)
+# ----------------------------
+# A single group-by over League x Club x Position gives every count on the
+# page; the figures are built from it once per version (and per league for
+# the pies) and kept as plain specs, so reruns and league switches are
+# cache lookups.
+@st.cache_resource(max_entries=2)
+def player_aggregates(_df, version):
+    counts = _df.groupby(["League", "Club", "Position"], observed=True).size()
+    return counts[counts > 0]
 
-    st.markdown("### 📊 Player Demographics & Value Insights")
+def count_frame(counts, column):
+    frame = counts[counts > 0].sort_values(ascending=False, kind="stable").reset_index()
+    frame.columns = [column, "Count"]
+    return frame
 
-    league_counts = df["League"].value_counts().reset_index()
-    league_counts.columns = ["League", "Count"]
+@st.cache_resource(max_entries=2)
+def overview_figures(_df, version):
+    counts = player_aggregates(_df, version)
+    league_counts = count_frame(counts.groupby(level="League", observed=True).sum(), "League")
     fig_league = px.pie(
         league_counts,
         names="League",
@@ -17,72 +29,86 @@ def show_players_page():
         title="🏆 League Distribution",
         hole=0.4
     )
+    fig_age = px.histogram(
+        _df,
+        x="Age",
+        nbins=10,
+        title="Age Distribution",
+        color_discrete_sequence=["#1be7b7"]
+    )
+    fig_value_hist = px.histogram(
+        _df,
+        x="Market Value (€ mil.)",
+        nbins=15,
+        title="Market Value Distribution",
+        color_discrete_sequence=["#ffa600"]
+    )
+    leagues = sorted(league_counts["League"].tolist())
+    return fig_league.to_dict(), fig_age.to_dict(), fig_value_hist.to_dict(), leagues
+
+@st.cache_resource(max_entries=64)
+def league_figures(_df, version, league):
+    counts = player_aggregates(_df, version)
+    if league != "All":
+        counts = counts.xs(league, level="League")
+
+    club_counts = count_frame(counts.groupby(level="Club", observed=True).sum(), "Club")
+    fig_club_pie = px.pie(
+        club_counts,
+        names="Club",
+        values="Count",
+        title=f"Club Distribution – {league}",
+        hole=0.3
+    )
+    fig_club_pie.update_traces(
+    textinfo="percent",
+    textposition="inside",
+    insidetextorientation="radial",
+    pull=[0.05 if count < club_counts["Count"].max() * 0.1 else 0 for count in club_counts["Count"]],
+    textfont=dict(size=12)
+    )
+
+    position_counts = count_frame(counts.groupby(level="Position", observed=True).sum(), "Position")
+    fig_position_pie = px.pie(
+        position_counts,
+        names="Position",
+        values="Count",
+        title=f"Position Distribution – {league}",
+        hole=0.3
+    )
+    fig_position_pie.update_traces(
+    textinfo="percent",
+    textposition="inside",
+    insidetextorientation="radial",
+    pull=[0.05 if count < position_counts["Count"].max() * 0.1 else 0 for count in position_counts["Count"]],
+    textfont=dict(size=10)
+    )
+    return fig_club_pie.to_dict(), fig_position_pie.to_dict()
+
+def show_players_page():
+    df, version = get_player_snapshot()
+    st.title(f"Top {len(df)} Most Valuable Players")
+    st.dataframe(df, hide_index=True)
+
+    st.markdown("### 📊 Player Demographics & Value Insights")
+
+    fig_league, fig_age, fig_value_hist, leagues = overview_figures(df, version)
     st.plotly_chart(fig_league, use_container_width=True)
 
     col1, col2 = st.columns(2)
     with col1:
-        fig_age = px.histogram(
-            df,
-            x="Age",
-            nbins=10,
-            title="Age Distribution",
-            color_discrete_sequence=["#1be7b7"]
-        )
         st.plotly_chart(fig_age, use_container_width=True)
     with col2:
-        fig_value_hist = px.histogram(
-            df,
-            x="Market Value (€ mil.)",
-            nbins=15,
-            title="Market Value Distribution",
-            color_discrete_sequence=["#ffa600"]
-        )
         st.plotly_chart(fig_value_hist, use_container_width=True)
 
-    leagues = sorted(df["League"].unique())
     selected_league_for_pies = st.selectbox("Select a League", ["All"] + leagues, key="pie_league_filter")
-    if selected_league_for_pies != "All":
-        league_df = df[df["League"] == selected_league_for_pies]
-    else:
-        league_df = df
+    fig_club_pie, fig_position_pie = league_figures(df, version, selected_league_for_pies)
 
     col1, col2 = st.columns([3,2])
     with col1:
-        club_counts = league_df["Club"].value_counts().reset_index()
-        club_counts.columns = ["Club", "Count"]
-        fig_club_pie = px.pie(
-            club_counts,
-            names="Club",
-            values="Count",
-            title=f"Club Distribution – {selected_league_for_pies}",
-            hole=0.3
-        )
-        fig_club_pie.update_traces(
-        textinfo="percent",
-        textposition="inside",
-        insidetextorientation="radial",
-        pull=[0.05 if count < club_counts["Count"].max() * 0.1 else 0 for count in club_counts["Count"]],
-        textfont=dict(size=12)
-        )
         st.plotly_chart(fig_club_pie, use_container_width=True)
 
     with col2:
-        position_counts = league_df["Position"].value_counts().reset_index()
-        position_counts.columns = ["Position", "Count"]
-        fig_position_pie = px.pie(
-            position_counts,
-            names="Position",
-            values="Count",
-            title=f"Position Distribution – {selected_league_for_pies}",
-            hole=0.3
-        )
-        fig_position_pie.update_traces(
-        textinfo="percent",
-        textposition="inside",
-        insidetextorientation="radial",
-        pull=[0.05 if count < position_counts["Count"].max() * 0.1 else 0 for count in position_counts["Count"]],
-        textfont=dict(size=10)
-        )
         st.plotly_chart(fig_position_pie, use_container_width=True)
 
 
@@ -0,0 +1,44 @@
+from packages import st, np, bisect
+
+# ----------------------------
+# Player index (shared by Player Info, Footdle and the bot)
+# ----------------------------
+# Built once per dataset version: name -> row position and the name list
+# in sorted order. Pages look players up by name in O(1) instead of
+# scanning the Name column, and the "not yet guessed" dropdown is a mask
+# over the sorted list instead of a re-sort.
+class PlayerIndex:
+    def __init__(self, df):
+        self.df = df
+        self.names = df["Name"].tolist()
+        self.n = len(self.names)
+        self.positions = {}
+        for i, name in enumerate(self.names):
+            self.positions.setdefault(name, i)  # duplicate names resolve to the first row
+        order = sorted(range(self.n), key=self.names.__getitem__)
+        self.sorted_names = [self.names[i] for i in order]
+        self._sorted = np.array(self.sorted_names, dtype=object)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def position(self, name):
+        return self.positions[name]
+
+    def row(self, name):
+        return self.df.iloc[self.positions[name]]
+
+    def unguessed(self, guessed_names):
+        # sorted names minus the guessed ones; duplicates sit next to each
+        # other in the sorted list, so each guess is two binary searches
+        if not guessed_names:
+            return self.sorted_names
+        keep = np.ones(self.n, dtype=bool)
+        for name in set(guessed_names):
+            keep[bisect.bisect_left(self.sorted_names, name):bisect.bisect_right(self.sorted_names, name)] = False
+        return self._sorted[keep].tolist()
+
+@st.cache_resource(max_entries=2)
+def get_player_index(_df, version):
+    # one index per dataset version, shared by every session
+    return PlayerIndex(_df)
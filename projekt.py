@@ -1,8 +1,13 @@
-from packages import st, pd
-from packages import px
-from scrape import get_players, get_wikipedia_image, POSITION_MAP, convert_market_value, CLUB_TO_LEAGUE
-from footdle import footdle_page
-from playerinfo import show_players_page
+from packages import st
+from admin import admin_enabled, show_admin_panel
+import metrics
+import warmup
+
+# Page modules (and pandas, plotly, requests, bs4 behind them) are imported
+# inside the page that uses them, so Home renders without loading them.
+
+metrics.start_exporter()  # periodic export to FOOTDLE_METRICS_FILE, if set
+warmup.start()            # data, caches and photos load in the background from the first run
 
 # ----------------------------
 # Sidebar Navigation
@@ -24,6 +29,11 @@ with st.sidebar:
     if st.button("📋 Players List"): 
         st.session_state.page = 'Players List'
         st.rerun()
+    if st.button("🏆 Leaderboard"):
+        st.session_state.page = 'Leaderboard'
+        st.rerun()
+    if admin_enabled():
+        show_admin_panel()
 
 # ----------------------------
 # Home Page
@@ -57,11 +67,20 @@ if st.session_state.page == 'Home':
 # Player Info Page
 # ----------------------------
 elif st.session_state.page == 'Player Info':
+    from scrape import get_player_snapshot, get_wikipedia_image, prefetch_images, get_value_history, POSITION_MAP
+    from packages import pd, px
+    from players import get_player_index
+    from snapshot import market_value_label
     st.title("Football Player Statistics")
-    df = get_players()
-    player_names = sorted(df["Name"].tolist())
+    df, version = get_player_snapshot()
+    players = get_player_index(df, version)
+    player_names = players.sorted_names
+    prefetch_images(player_names)  # no-op while the warm-up is resolving them
+    warm = warmup.progress()
+    if warm["stage"] == "images":
+        st.caption(f"Loading player photos in the background… {warm['done']}/{warm['total']}")
     player_choice = st.selectbox("Choose a player:", player_names)
-    player_row = df[df["Name"] == player_choice].iloc[0]
+    player_row = players.row(player_choice)
     REV_POSITION_MAP = {v: k for k, v in POSITION_MAP.items()}
     full_position = REV_POSITION_MAP.get(player_row["Position"], player_row["Position"])
     col1, col2 = st.columns([1, 2])
@@ -78,17 +97,41 @@ elif st.session_state.page == 'Player Info':
         st.markdown(f"**League:** {player_row['League']}")
         st.markdown(f"**Country:** {player_row['Country']}")
         st.markdown(f"**Position:** {full_position}")
-        st.markdown(f"**Market Value:** €{player_row['Market Value (€ mil.)']}m")
+        st.markdown(f"**Market Value:** €{market_value_label(player_row['Market Value (€ mil.)'])}m")
+
+    st.subheader("📈 Market value history")
+    history = get_value_history(player_choice)
+    if len(history) < 2:
+        st.caption("No market value changes recorded for this player yet.")
+    else:
+        # each value holds until the next change, so draw steps up to now
+        now = history.iloc[[-1]].assign(snapshot_at=pd.Timestamp.now(tz="UTC"))
+        history = pd.concat([history, now], ignore_index=True)
+        fig = px.line(history, x="snapshot_at", y="market_value", line_shape="hv",
+                      hover_data=["club"], labels={"snapshot_at": "Date", "market_value": "Market Value (€ mil.)", "club": "Club"})
+        st.plotly_chart(fig, use_container_width=True)
 
 # ----------------------------
 # Footdle Page 
 # ----------------------------
 elif st.session_state.page == 'FootDle':
-    footdle_page()
+    from footdle import footdle_page
+    with metrics.timed("page_render", page="FootDle"):
+        footdle_page()
   
 
 # ----------------------------
 # Players Page
 # ----------------------------
 elif st.session_state.page == 'Players List':
-    show_players_page()
+    from playerinfo import show_players_page
+    with metrics.timed("page_render", page="Players List"):
+        show_players_page()
+
+# ----------------------------
+# Leaderboard Page
+# ----------------------------
+elif st.session_state.page == 'Leaderboard':
+    from leaderboard import show_leaderboard_page
+    with metrics.timed("page_render", page="Leaderboard"):
+        show_leaderboard_page()
@@ -0,0 +1,180 @@
+import argparse
+import cProfile
+import pstats
+import sys
+
+from packages import pd, os, json, threading, time
+from snapshot import DATA_DIR, typed_players, dataset_version
+from feedback import FeedbackEngine
+from decision_tree import load_tree
+from game import FootdleGame, GAVE_UP
+import metrics
+
+# ----------------------------
+# Replay log
+# ----------------------------
+# Every game the app finishes (or restarts after a guess) is appended to a
+# JSON-lines log: mode, dataset version, seed, secret, difficulty, the
+# user's and bot's guesses as row indices, the result and the ms from the
+# start to each guess. The player table of each logged version is kept
+# next to it under data/datasets/, so a log replays on the exact data.
+# As a script this module re-plays logs headlessly and checks the results,
+#   python replay.py data/replays.jsonl
+#   python replay.py data/replays.jsonl --repeat 100 --profile
+REPLAY_PATH = os.environ.get("FOOTDLE_REPLAY_LOG", os.path.join(DATA_DIR, "replays.jsonl"))
+DATASETS_DIR = os.path.join(DATA_DIR, "datasets")
+FORMAT = 1
+
+_lock = threading.Lock()
+_archived = set()  # versions already saved by this process
+
+def dataset_path(version):
+    return os.path.join(DATASETS_DIR, f"{version}.parquet")
+
+def archive_dataset(df, version):
+    if version in _archived:
+        return
+    path = dataset_path(version)
+    if not os.path.exists(path):
+        os.makedirs(DATASETS_DIR, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    _archived.add(version)
+
+def game_record(game):
+    return {
+        "v": FORMAT,
+        "mode": game.mode,
+        "version": game.version,
+        "seed": game.seed,
+        "secret": game.secret,
+        "difficulty": game.difficulty,
+        "day": game.day,
+        "tree": game.tree,  # Impossible bot walked the precomputed decision tree
+        "guesses": game.guesses,
+        "bot_guesses": game.bot_guesses,
+        "status": game.status,
+        "started": round(game.started, 3),
+        "times": game.times,
+    }
+
+def log_game(game, df, path=REPLAY_PATH):
+    # never breaks the page: a game that cannot be logged is only counted
+    try:
+        archive_dataset(df, game.version)
+        line = json.dumps(game_record(game), separators=(",", ":"))
+        with _lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        metrics.count("replays_logged", mode=game.mode)
+    except OSError:
+        metrics.count("replay_log_errors")
+
+def read_log(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# ----------------------------
+# Replaying
+# ----------------------------
+def load_dataset(version):
+    # the archived player table of a version, None if missing or changed
+    path = dataset_path(version)
+    if not os.path.exists(path):
+        return None
+    df = typed_players(pd.read_parquet(path))
+    return df if dataset_version(df) == version else None
+
+def replay(record, engine, tree=None):
+    # re-plays one logged game; returns the game and the seconds per turn
+    game = FootdleGame.start(engine, record["version"], record["mode"], seed=record["seed"],
+                             secret=record["secret"] if record["mode"] == "Daily" else None,
+                             difficulty=record["difficulty"], day=record["day"])
+    turns = []
+    for guess in record["guesses"]:
+        start = time.perf_counter()
+        if record["mode"] == "Computer":
+            game.computer_turn(engine, guess, tree=tree)
+        else:
+            game.solo_turn(engine, guess)
+        turns.append(time.perf_counter() - start)
+    if record["status"] == GAVE_UP:
+        game.give_up()
+    return game, turns
+
+def mismatches(record, game):
+    return [field for field in ("secret", "bot_guesses", "status") if getattr(game, field) != record[field]]
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def replay_log(records, repeat=1):
+    engines, trees = {}, {}
+    summary = {"games": 0, "matched": 0, "mismatched": 0, "skipped": 0}
+    failures, turns = [], []
+    start = time.perf_counter()
+    for record in records:
+        version = record["version"]
+        if version not in engines:
+            df = load_dataset(version)
+            engines[version] = FeedbackEngine(df) if df is not None else None
+        engine = engines[version]
+        if engine is None:
+            summary["skipped"] += 1  # dataset not archived
+            continue
+        tree = None
+        if record.get("tree"):
+            if version not in trees:
+                trees[version] = load_tree(version)
+            tree = trees[version]
+        for _ in range(repeat):
+            game, game_turns = replay(record, engine, tree=tree)
+            turns += game_turns
+            summary["games"] += 1
+            wrong = mismatches(record, game)
+            if wrong:
+                summary["mismatched"] += 1
+                failures.append((record, wrong))
+            else:
+                summary["matched"] += 1
+    wall = time.perf_counter() - start
+    summary.update({
+        "turns": len(turns),
+        "wall_s": wall,
+        "games_per_s": summary["games"] / wall if wall else 0.0,
+        "turn_p50_us": percentile(turns, 0.5) * 1e6,
+        "turn_p99_us": percentile(turns, 0.99) * 1e6,
+    })
+    return summary, failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-play Footdle replay logs headlessly and check the results")
+    parser.add_argument("logs", nargs="*", default=[REPLAY_PATH], help="JSON-lines replay logs")
+    parser.add_argument("--repeat", type=int, default=1, help="times each game is re-played (for profiling)")
+    parser.add_argument("--limit", type=int, help="replay only the first N games")
+    parser.add_argument("--profile", action="store_true", help="print the top functions by cumulative time")
+    args = parser.parse_args()
+
+    records = [record for path in args.logs for record in read_log(path)][:args.limit]
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    summary, failures = replay_log(records, repeat=args.repeat)
+    if profiler:
+        profiler.disable()
+
+    for key, value in summary.items():
+        print(f"{key:<14} {value:>12.1f}" if isinstance(value, float) else f"{key:<14} {value:>12}")
+    for record, wrong in failures[:10]:
+        print(f"  MISMATCH {record['mode']} seed={record['seed']} version={record['version']}: {', '.join(wrong)}")
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,24 @@
 
-from packages import requests, pd, BeautifulSoup, wikipedia, st
+from packages import pd, BeautifulSoup, SoupStrainer, HTML_PARSER, st, os, gc, re, hashlib, urljoin, deque, ThreadPoolExecutor
+from fetch import Fetcher, FetchError
+from snapshot import SnapshotStore, SNAPSHOT_PATH, SNAPSHOT_TTL, typed_players
+from listing import ListingCache, LISTING_PATH
+from clubs import ClubStore, ClubResolver, CLUBS_PATH
+from images import ImageStore, ImageResolver, IMAGES_PATH
+import metrics
 
 # ----------------------------
 # Get player image from Wikipedia
 # ----------------------------
-@st.cache_data(ttl=3600)
+@st.cache_resource
+def image_resolver():
+    return ImageResolver(ImageStore(IMAGES_PATH))
+
 def get_wikipedia_image(player_name):
-    try:
-        page_title = wikipedia.search(player_name)[0]
-        page = wikipedia.page(page_title)
-        response = requests.get(page.url)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        infobox = soup.find('table', {'class': 'infobox'})
-        if infobox:
-            img = infobox.find('img')
-            if img:
-                return "https:" + img['src']
-    except Exception:
-        return None
-    
+    return image_resolver().get(player_name)
+
+def prefetch_images(player_names):
+    image_resolver().resolve_in_background(list(player_names))
 
 # ----------------------------
 # Players scrape
@@ -37,6 +37,8 @@ POSITION_MAP = {
     "Second Striker": "CF",
 }
 
+# Leagues of well-known clubs, used when a club page cannot be looked up
+# (offline parsing, fixtures); the scraper resolves the rest from club pages.
 CLUB_TO_LEAGUE = {
     # Bundesliga
     "Bayern Munich": "Bundesliga",
@@ -89,39 +91,171 @@ def convert_market_value(mv_string):
         return int(num) if num.is_integer() else num
     return None
 
-@st.cache_data(ttl=3600)
+# ----------------------------
+# Page fetching
+# ----------------------------
+BASE_URL = os.environ.get("FOOTDLE_TRANSFERMARKT_URL", "https://www.transfermarkt.com/spieler-statistik/wertvollstespieler/marktwertetop")
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+MAX_WORKERS = 4  # concurrent page requests
+TIMEOUT = 10     # read timeout per request, in seconds
+
+class ListingError(FetchError):
+    # a response that is not a listing page (error page, captcha, redesign)
+    pass
+
+def iter_responses(urls, max_workers=MAX_WORKERS, timeout=TIMEOUT, fetcher=None, headers_for=None):
+    # yields responses in order, with at most max_workers pages in flight;
+    # headers_for(url) adds per-request headers (conditional requests)
+    fetcher = fetcher or Fetcher("transfermarkt", pool_size=max_workers, headers=HEADERS, timeout=timeout)
+
+    def fetch(url):
+        return fetcher.get(url, headers=headers_for(url) if headers_for else None)
+
+    if max_workers <= 1:
+        for url in urls:
+            yield fetch(url)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque()
+        for url in urls:
+            pending.append(pool.submit(fetch, url))
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+# ----------------------------
+# Listing parser
+# ----------------------------
+PAGES = int(os.environ.get("FOOTDLE_PAGES", 4))  # 25 players per page
+COLUMNS = ["Name", "Position", "Age", "Country", "Club", "League", "Market Value (€ mil.)"]
+GC_EVERY = 8  # pages parsed between forced garbage collections
+ITEMS_TABLE = SoupStrainer("table", class_="items")  # parse only the players table
+PLAYER_ID = re.compile(r"/spieler/(\d+)")
+CLUB_ID = re.compile(r"/verein/(\d+)")
+
+def iter_keyed_rows(content):
+    # (key, club, record) per player. The key is the Transfermarkt player id
+    # from the profile link, which stays the same when a player changes
+    # page; club is (club id, club page link) when the row links the club.
+    with metrics.timed("parse_page"):
+        soup = BeautifulSoup(content, HTML_PARSER, parse_only=ITEMS_TABLE)
+    table = soup.find("table", class_="items")
+    if table is None:
+        soup.decompose()
+        raise ListingError("no players table on the listing page")
+    rows = table.find_all("tr", class_=["odd", "even"])
+    for row in rows:
+        tds = row.find_all("td")
+        if len(tds) >= 9:
+            name = tds[3].text.strip()
+            link = tds[3].find("a", href=PLAYER_ID)
+            key = PLAYER_ID.search(link["href"]).group(1) if link else name
+            age = tds[5].text.strip()
+            market_value_str = tds[8].text.strip()
+            market_value = convert_market_value(market_value_str)
+            position = tds[4].text.strip()
+            position_short = POSITION_MAP.get(position, position)
+            country_img = tds[6].find("img")
+            country = country_img["title"] if country_img else ""
+            club_img = tds[7].find("img") 
+            club = club_img["alt"] if club_img else "" 
+            league = CLUB_TO_LEAGUE.get(club, "Unknown")
+            club_link = tds[7].find("a", href=CLUB_ID)
+            club_ref = (CLUB_ID.search(club_link["href"]).group(1), club_link["href"]) if club_link else None
+            yield key, club_ref, (name, position_short, age, country, club, league, market_value)
+    soup.decompose()
+
+def iter_player_rows(content):
+    for _, _, record in iter_keyed_rows(content):
+        yield record
+
+def iter_listing(pages=PAGES, max_workers=MAX_WORKERS, timeout=TIMEOUT, base_url=BASE_URL, cache=None):
+    # yields (fresh, rows) per page. With a cache, pages are requested
+    # conditionally and only parsed when the server sends a new body.
+    urls = [f"{base_url}?page={page}" for page in range(1, pages + 1)]
+    headers_for = cache.conditional_headers if cache is not None else None
+    parsed = 0
+    for url, res in zip(urls, iter_responses(urls, max_workers=max_workers, timeout=timeout, headers_for=headers_for)):
+        entry = cache.get(url) if cache is not None else None
+        if entry is not None and res.status_code == 304:
+            metrics.count("listing_pages", state="not_modified")
+            yield False, entry[3]
+            continue
+        if res.status_code != 200:
+            raise ListingError(f"HTTP {res.status_code} from {url}")
+        digest = hashlib.sha1(res.content).hexdigest()
+        if entry is not None and entry[2] == digest:
+            metrics.count("listing_pages", state="unchanged")  # no validators, same body
+            yield False, entry[3]
+            continue
+        rows = list(iter_keyed_rows(res.content))
+        metrics.count("listing_pages", state="changed")
+        if cache is not None:
+            cache.save({url: (res.headers.get("ETag"), res.headers.get("Last-Modified"), digest, rows)})
+        yield True, rows
+        parsed += 1
+        if parsed % GC_EVERY == 0:
+            gc.collect()  # parse trees are cyclic garbage, collect them so memory stays flat
+
+def with_leagues(rows, resolver, base_url=BASE_URL):
+    # fills League from each club's page, one lookup per distinct club
+    clubs = {club_ref[0]: (record[4], urljoin(base_url, club_ref[1])) for club_ref, record in rows if club_ref}
+    with metrics.timed("resolve_leagues"):
+        leagues = resolver.leagues(clubs)
+    for club_ref, record in rows:
+        league = leagues.get(club_ref[0]) if club_ref else None
+        yield record[:5] + (league,) + record[6:] if league else record
+
+def scrape_players(pages=PAGES, max_workers=MAX_WORKERS, timeout=TIMEOUT, base_url=BASE_URL, cache=None, clubs=None):
+    merged = {}  # player key -> (club, record), in listing order
+    with metrics.timed("scrape_players"):
+        for fresh, rows in iter_listing(pages, max_workers=max_workers, timeout=timeout, base_url=base_url, cache=cache):
+            for key, club_ref, record in rows:
+                # a player who moved between pages mid-scrape: the freshly parsed row wins
+                if fresh or key not in merged:
+                    merged[key] = (club_ref, record)
+    if clubs is not None:
+        records = list(with_leagues(merged.values(), clubs, base_url=base_url))
+    else:
+        records = [record for _, record in merged.values()]
+    columns = list(zip(*records)) or [[] for _ in COLUMNS]
+    df = pd.DataFrame(dict(zip(COLUMNS, columns)))  # built once, column by column
+    return typed_players(df)
+
+# ----------------------------
+# Players snapshot (shared by all pages)
+# ----------------------------
+@st.cache_resource
+def history_store():
+    from history import HistoryStore  # pyarrow is only loaded once the store is used
+    return HistoryStore()
+
+@st.cache_resource
+def listing_cache():
+    return ListingCache(LISTING_PATH)
+
+@st.cache_resource
+def club_resolver():
+    return ClubResolver(ClubStore(CLUBS_PATH))
+
+@st.cache_resource
+def player_store():
+    history = history_store()
+    cache, clubs = listing_cache(), club_resolver()
+    store = SnapshotStore(SNAPSHOT_PATH, lambda: scrape_players(cache=cache, clubs=clubs), ttl=SNAPSHOT_TTL, on_publish=history.append)
+    if store.df is not None:
+        history.append(store.df, store.saved_at)  # no-op unless the snapshot predates the history
+    return store
+
 def get_players():
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    base_url = "https://www.transfermarkt.com/spieler-statistik/wertvollstespieler/marktwertetop"
-    data = []
-    for page in range(1, 5):  # Pages 1 to 4 = 100 players
-        url = f"{base_url}?page={page}"
-        res = requests.get(url, headers=headers)
-        soup = BeautifulSoup(res.content, "html.parser")
-        table = soup.find("table", class_="items")
-        rows = table.find_all("tr", class_=["odd", "even"])
-        for row in rows:
-            tds = row.find_all("td")
-            if len(tds) >= 9:
-                name = tds[3].text.strip()
-                age = tds[5].text.strip()
-                market_value_str = tds[8].text.strip()
-                market_value = convert_market_value(market_value_str)
-                position = tds[4].text.strip()
-                position_short = POSITION_MAP.get(position, position)
-                country_img = tds[6].find("img")
-                country = country_img["title"] if country_img else ""
-                club_img = tds[7].find("img") 
-                club = club_img["alt"] if club_img else "" 
-                league = CLUB_TO_LEAGUE.get(club, "Unknown")
-                data.append({
-                    "Name": name,
-                    "Position": position_short,
-                    "Age": age,
-                    "Country": country,
-                    "Club": club,
-                    "League": league,
-                    "Market Value (€ mil.)": market_value
-                })
-    df = pd.DataFrame(data)
-    return df
\ No newline at end of file
+    return player_store().get()
+
+def get_player_snapshot():
+    return player_store().current()
+
+def get_players_by_version(version):
+    return player_store().by_version(version)
+
+def get_value_history(name):
+    return history_store().value_history(name)
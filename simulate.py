@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from packages import np
+from feedback import FeedbackEngine, ALL_EQUAL
+from snapshot import dataset_version
+from solver import BotState, CONTAMINATION, bot_move, pick
+
+# Headless Footdle simulator. Plays seeded games outside Streamlit across a
+# process pool and reports win rates, guess-count distributions and
+# per-move latency, e.g.
+#   python simulate.py solo user:consistent --games 100000
+#   python simulate.py versus user:consistent bot:Medium --games 1000000
+#   python simulate.py versus bot:Hard bot:Impossible --synthetic 5000
+#   python simulate.py solo bot:Impossible --tree
+# Every game is seeded from --seed and its number alone, so the results do
+# not depend on --workers or on how games are split between processes.
+
+# ----------------------------
+# Players: bot difficulties and simple user models
+# ----------------------------
+USER_MODELS = {
+    "random",      # guesses any player it has not tried yet
+    "consistent",  # guesses a random player that fits all hints so far
+    "solver",      # plays like the Impossible bot
+}
+
+def parse_player(spec):
+    kind, _, name = spec.partition(":")
+    if kind == "bot" and name in CONTAMINATION or kind == "user" and name in USER_MODELS:
+        return kind, name
+    raise argparse.ArgumentTypeError(f"unknown player {spec!r}, use bot:<{'|'.join(CONTAMINATION)}> or user:<{'|'.join(sorted(USER_MODELS))}>")
+
+def move(engine, player, state, secret, rng, tree=None):
+    kind, name = player
+    if kind == "bot":
+        return bot_move(engine, state, secret, name, rng, tree=tree)
+    if name == "solver":
+        return bot_move(engine, state, secret, "Impossible", rng)
+    possible, guessed = state.masks()
+    if name == "random" or not (possible & ~guessed).any():
+        guess = pick(~guessed, rng)
+    else:
+        guess = pick(possible & ~guessed, rng)
+    state.record(engine, guess, engine.feedback(guess, secret))
+    return guess
+
+# ----------------------------
+# Games
+# ----------------------------
+LATENCY_BUCKETS = np.logspace(-7, 0, 141)  # 100 ns .. 1 s, 20 buckets per decade
+
+class Stats:
+    def __init__(self, n_players, max_turns):
+        self.games = 0
+        self.outcomes = np.zeros(n_players + 2, dtype=np.int64)  # wins per player, draw, unfinished
+        self.turns = np.zeros(max_turns + 1, dtype=np.int64)
+        self.latency = np.zeros(len(LATENCY_BUCKETS) + 1, dtype=np.int64)
+        self.latency_sum = 0.0
+        self.moves = 0
+
+    def merge(self, other):
+        self.games += other.games
+        self.outcomes += other.outcomes
+        self.turns += other.turns
+        self.latency += other.latency
+        self.latency_sum += other.latency_sum
+        self.moves += other.moves
+
+    def percentile(self, q):
+        if not self.moves:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.latency), q * self.moves))
+        return float(LATENCY_BUCKETS[min(bucket, len(LATENCY_BUCKETS) - 1)])
+
+def play(engine, players, secret, rng, stats, max_turns, tree=None):
+    # every turn each player guesses once, in order; same rules as the app
+    states = [BotState(engine.n) for _ in players]
+    for turn in range(1, max_turns + 1):
+        correct = []
+        for player, state in zip(players, states):
+            start = time.perf_counter()
+            guess = move(engine, player, state, secret, rng, tree)
+            elapsed = time.perf_counter() - start
+            stats.latency[np.searchsorted(LATENCY_BUCKETS, elapsed)] += 1
+            stats.latency_sum += elapsed
+            stats.moves += 1
+            correct.append(guess is not None and engine.feedback(guess, secret) == ALL_EQUAL)
+        if any(correct):
+            stats.turns[turn] += 1
+            stats.outcomes[correct.index(True) if sum(correct) == 1 else len(players)] += 1
+            return
+    stats.turns[max_turns] += 1
+    stats.outcomes[len(players) + 1] += 1
+
+_engine = None
+_tree = None
+
+def _init_worker(df, tree=None):
+    global _engine, _tree
+    _engine = FeedbackEngine(df)
+    _tree = tree
+
+def run_chunk(players, seed, first, count, max_turns):
+    stats = Stats(len(players), max_turns)
+    for game in range(first, first + count):
+        rng = np.random.default_rng([seed, game])  # each game is reproducible on its own
+        secret = int(rng.integers(_engine.n))
+        play(_engine, players, secret, rng, stats, max_turns, _tree)
+        stats.games += 1
+    return stats
+
+def simulate(df, players, games, seed=0, workers=None, chunk=1000, max_turns=None, tree=None):
+    max_turns = max_turns or len(df)
+    workers = workers or os.cpu_count() or 1
+    total = Stats(len(players), max_turns)
+    chunks = [(first, min(chunk, games - first)) for first in range(0, games, chunk)]
+    if workers == 1:
+        _init_worker(df, tree)
+        for first, count in chunks:
+            total.merge(run_chunk(players, seed, first, count, max_turns))
+        return total
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df, tree)) as pool:
+        futures = [pool.submit(run_chunk, players, seed, first, count, max_turns) for first, count in chunks]
+        for future in futures:
+            total.merge(future.result())
+    return total
+
+# ----------------------------
+# Report
+# ----------------------------
+def report(stats, players):
+    labels = [f"{kind}:{name}" for kind, name in players]
+    turns = np.arange(len(stats.turns))
+    mean_turns = float((turns * stats.turns).sum() / max(stats.games, 1))
+    result = {
+        "games": stats.games,
+        "wins": {label: int(stats.outcomes[i]) for i, label in enumerate(labels)},
+        "draws": int(stats.outcomes[len(players)]),
+        "unfinished": int(stats.outcomes[len(players) + 1]),
+        "turns_mean": mean_turns,
+        "turns_histogram": {int(t): int(c) for t, c in zip(turns, stats.turns) if c},
+        "move_latency_mean_ms": stats.latency_sum / max(stats.moves, 1) * 1000,
+        "move_latency_p50_ms": stats.percentile(0.5) * 1000,
+        "move_latency_p99_ms": stats.percentile(0.99) * 1000,
+    }
+    return result
+
+def load_players(args):
+    if args.synthetic:
+        from fixtures import synthetic_players
+        return synthetic_players(args.synthetic, seed=args.seed)
+    if args.data == "fixtures":
+        from fixtures import fixture_players
+        return fixture_players()
+    from snapshot import SnapshotStore, SNAPSHOT_PATH
+    df = SnapshotStore(SNAPSHOT_PATH, loader=None).df
+    if df is None:
+        raise SystemExit(f"no snapshot at {SNAPSHOT_PATH}, run the app once or use --data fixtures")
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Footdle simulator")
+    parser.add_argument("mode", choices=["solo", "versus"])
+    parser.add_argument("players", nargs="+", type=parse_player, help="bot:<difficulty> or user:<model>")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=1000, help="games per task")
+    parser.add_argument("--data", choices=["snapshot", "fixtures"], default="snapshot")
+    parser.add_argument("--synthetic", type=int, help="use a synthetic pool of this many players")
+    parser.add_argument("--tree", action="store_true", help="Impossible bots walk the prebuilt decision tree")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+    if (args.mode == "solo") != (len(args.players) == 1):
+        parser.error("solo takes one player, versus takes two or more")
+
+    df = load_players(args)
+    tree = None
+    if args.tree:
+        from decision_tree import load_tree, tree_path
+        tree = load_tree(dataset_version(df))
+        if tree is None:
+            raise SystemExit(f"no decision tree at {tree_path(dataset_version(df))}, build it with decision_tree.py")
+    start = time.perf_counter()
+    stats = simulate(df, args.players, args.games, seed=args.seed, workers=args.workers, chunk=args.chunk, tree=tree)
+    elapsed = time.perf_counter() - start
+    result = report(stats, args.players)
+    result["players_in_pool"] = len(df)
+    result["wall_s"] = elapsed
+    result["games_per_s"] = stats.games / elapsed
+
+    print(f"{stats.games} games over {len(df)} players in {elapsed:.1f}s ({result['games_per_s']:.0f} games/s)")
+    for label, wins in result["wins"].items():
+        print(f"  {label:20s} wins {wins / stats.games:7.2%}")
+    if len(args.players) > 1:
+        print(f"  {'draws':20s}      {result['draws'] / stats.games:7.2%}")
+    print(f"  turns: mean {result['turns_mean']:.2f}, histogram {result['turns_histogram']}")
+    print(f"  move latency: mean {result['move_latency_mean_ms']:.3f} ms, p50 {result['move_latency_p50_ms']:.3f} ms, p99 {result['move_latency_p99_ms']:.3f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=1)
+
+if __name__ == "__main__":
+    main()
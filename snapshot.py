@@ -0,0 +1,169 @@
+from packages import pd, os, sqlite3, threading, time, hashlib
+import metrics
+
+# ----------------------------
+# Persistent player snapshot
+# ----------------------------
+DATA_DIR = os.environ.get("FOOTDLE_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "players.sqlite")
+SNAPSHOT_TTL = 3600  # seconds before a background refresh is triggered
+KEEP_VERSIONS = 2    # snapshots kept in memory so running games outlive a refresh
+RETRY_INTERVAL = 60  # seconds between refresh attempts while the source is failing
+
+# ----------------------------
+# Typed player table
+# ----------------------------
+# Age as a small nullable integer, Market Value as float and the repeated
+# text columns as categoricals: a fraction of the memory of object columns,
+# and comparisons / group-bys work on integer codes. The table is shared by
+# every session; pandas' copy-on-write keeps it read-only for them.
+CATEGORICAL = ["Position", "Country", "Club", "League"]
+
+def typed_players(df):
+    df = df.copy()
+    df["Name"] = df["Name"].astype(str)
+    df["Age"] = pd.to_numeric(df["Age"], errors="coerce").astype("Int8")
+    df["Market Value (€ mil.)"] = pd.to_numeric(df["Market Value (€ mil.)"], errors="coerce").astype(float)
+    for col in CATEGORICAL:
+        df[col] = df[col].astype("category")
+    return df
+
+def market_value_label(value):
+    # as the listing writes it: 192.0 -> "192", 0.8 -> "0.8"
+    return "-" if pd.isna(value) else f"{value:g}"
+
+def dataset_version(df):
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    digest.update(",".join(df.columns).encode())
+    return digest.hexdigest()[:12]
+
+class SnapshotStore:
+    # Serves the last good snapshot from disk and refreshes it in the
+    # background once it is older than ttl (stale-while-revalidate). A
+    # failed refresh keeps the last good snapshot and is retried after
+    # RETRY_INTERVAL. on_publish(df, saved_at) is called after every
+    # successful refresh.
+    def __init__(self, path, loader, ttl=SNAPSHOT_TTL, on_publish=None):
+        self.path = path
+        self.loader = loader
+        self.ttl = ttl
+        self.on_publish = on_publish
+        self.lock = threading.Lock()
+        self.cold_lock = threading.Lock()  # one cold load, concurrent first callers wait for it
+        self.refreshing = False
+        self.failed_at = 0.0
+        self.df, self.saved_at, self.version = self._read()
+        self.recent = {}  # version -> df
+        if self.df is not None:
+            self.recent[self.version] = self.df
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return None, 0.0, None
+        conn = sqlite3.connect(self.path)
+        try:
+            df = pd.read_sql("SELECT * FROM players", conn)
+            saved_at, version = conn.execute("SELECT saved_at, version FROM meta").fetchone()
+        finally:
+            conn.close()
+        df = typed_players(df)
+        if dataset_version(df) != version:
+            version = dataset_version(df)  # snapshot written before the typed table
+        return df, saved_at, version
+
+    def _write(self, df, saved_at, version):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            df.to_sql("players", conn, index=False)
+            conn.execute("CREATE TABLE meta (saved_at REAL, version TEXT)")
+            conn.execute("INSERT INTO meta VALUES (?, ?)", (saved_at, version))
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, self.path)  # atomic swap, readers never see a partial file
+
+    def _touch(self, saved_at):
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("UPDATE meta SET saved_at = ?", (saved_at,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def is_stale(self):
+        now = time.time()
+        return now - self.saved_at > self.ttl and now - self.failed_at > RETRY_INTERVAL
+
+    def refresh(self):
+        try:
+            with metrics.timed("snapshot_refresh"):
+                df = self.loader()
+            if df is None or df.empty:
+                raise ValueError("the loader returned no players")
+            df = typed_players(df)
+            saved_at = time.time()
+            version = dataset_version(df)
+            if version == self.version:
+                # same data: keep the current table (and every cache keyed
+                # by its version), only restart the ttl
+                self._touch(saved_at)
+                metrics.count("snapshot_refreshes", result="unchanged")
+                with self.lock:
+                    self.saved_at = saved_at
+                return
+            self._write(df, saved_at, version)
+            metrics.count("snapshot_refreshes", result="published")
+            with self.lock:
+                self.df, self.saved_at, self.version = df, saved_at, version
+                self.recent[version] = df
+                while len(self.recent) > KEEP_VERSIONS:
+                    del self.recent[next(iter(self.recent))]
+            if self.on_publish is not None:
+                try:
+                    self.on_publish(df, saved_at)
+                except Exception:
+                    metrics.count("publish_errors")  # the snapshot itself is already served
+        except Exception:
+            metrics.count("snapshot_refreshes", result="failed")
+            with self.lock:
+                self.failed_at = time.time()
+            if self.df is None:
+                raise  # nothing to fall back to yet
+        finally:
+            with self.lock:
+                self.refreshing = False
+
+    def refresh_in_background(self):
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+    def current(self):
+        # (df, version) of the same snapshot, even while a refresh swaps it
+        self.get()
+        with self.lock:
+            return self.df, self.version
+
+    def by_version(self, version):
+        # the snapshot a game was started on, None once it has been dropped
+        with self.lock:
+            return self.recent.get(version)
+
+    def get(self):
+        metrics.count("snapshot_reads", state="cold" if self.df is None else "stale" if self.is_stale() else "fresh")
+        if self.df is None:
+            # first run ever, nothing to serve yet
+            with self.cold_lock:
+                if self.df is None:
+                    with self.lock:
+                        self.refreshing = True
+                    self.refresh()
+        elif self.is_stale():
+            self.refresh_in_background()
+        return self.df
@@ -0,0 +1,180 @@
+from packages import np
+from feedback import ATTRIBUTES
+
+# ----------------------------
+# Footdle solver (Against Computer bot)
+# ----------------------------
+# The bot keeps every player that is consistent with *all* the feedback it
+# has received (matches, mismatches and the Age / Market Value arrows) and
+# guesses the candidate whose feedback splits the remaining candidates
+# best, i.e. with the highest expected information (entropy).
+PATTERNS = 1 << (2 * len(ATTRIBUTES))  # 4096 possible feedback codes
+MAX_SCORED = 256                      # guesses scored per turn, sampled above that
+SCORED_CELLS = 1 << 16                # (guess, candidate) pairs scored per turn at most ...
+MIN_SCORED = 32                       # ... but never fewer guesses than this
+
+CONTAMINATION = {
+    "Noob": 100,
+    "Easy": 50,
+    "Medium": 25,
+    "Hard": 10,
+    "Impossible": 0
+}
+
+def feedback_block(engine, guesses, candidates):
+    return engine.rows(guesses, candidates)
+
+def entropies(engine, guesses, candidates):
+    # expected information (bits) of each guess over the candidate set
+    block = feedback_block(engine, guesses, candidates).astype(np.int64)
+    offsets = np.arange(len(guesses), dtype=np.int64)[:, None] * PATTERNS
+    keys = (block + offsets).ravel()
+    counts = np.bincount(keys, minlength=len(guesses) * PATTERNS)
+    # sum of c*log2(c) over each guess's (mostly empty) cells, as one
+    # log2(c) per candidate instead of a log over all 4096 codes
+    n_log_n = np.log2(counts[keys]).reshape(len(guesses), len(candidates)).sum(axis=1)
+    total = len(candidates)
+    return np.log2(total) - n_log_n / total
+
+def best_guesses(engine, candidates, rng, max_scored=MAX_SCORED):
+    # the equally best of (a sample of) the candidates; large candidate
+    # sets score fewer guesses so a turn's work stays bounded
+    max_scored = min(max_scored, max(MIN_SCORED, SCORED_CELLS // len(candidates)))
+    guesses = candidates
+    if len(guesses) > max_scored:
+        guesses = rng.choice(candidates, max_scored, replace=False)
+    scores = entropies(engine, guesses, candidates)
+    return guesses[scores >= scores.max() - 1e-9]
+
+def best_guess(engine, candidates, rng, max_scored=MAX_SCORED):
+    if len(candidates) <= 2:
+        return int(rng.choice(candidates))
+    return int(rng.choice(best_guesses(engine, candidates, rng, max_scored)))
+
+OPENING_SLACK = 0.05  # bits below the best opening still considered equally good
+OPENING_SEED = 0      # samples the scored openings, the same for every game
+
+def opening_guess(engine, rng):
+    # the first move only depends on the pool, score it once per engine.
+    # The sample comes from a fixed seed, not the game's rng, so a game's
+    # seed alone decides its moves whichever game filled the cache.
+    if getattr(engine, "openings", None) is None:
+        everyone = np.arange(engine.n)
+        sample_rng = np.random.default_rng(OPENING_SEED)
+        guesses = everyone if engine.n <= MAX_SCORED else np.sort(sample_rng.choice(everyone, MAX_SCORED, replace=False))
+        scores = entropies(engine, guesses, everyone)
+        engine.openings = guesses[scores >= scores.max() - OPENING_SLACK]
+    return int(rng.choice(engine.openings))
+
+def second_guess(engine, first, code, candidates, rng):
+    # The candidates after one guess only depend on that guess and its
+    # feedback, and the first guess is one of the few openings, so the
+    # second move is scored once per (first guess, code) and engine, from
+    # a fixed sample like the openings. Later games only pick among them.
+    if len(candidates) <= 2:
+        return int(rng.choice(candidates))
+    seconds = getattr(engine, "seconds", None)
+    if seconds is None:
+        seconds = engine.seconds = {}
+    best = seconds.get((first, code))
+    if best is None:
+        sample_rng = np.random.default_rng([OPENING_SEED, first, code])
+        best = seconds[(first, code)] = np.sort(best_guesses(engine, candidates, sample_rng))
+    return int(rng.choice(best))
+
+class BotState:
+    # What the bot knows, as two packed bitsets over the shared player
+    # table: players still consistent with its feedback, and players it has
+    # already guessed, plus the feedback codes it received (used to walk
+    # the decision tree). A few hundred bytes per session, no DataFrames.
+    __slots__ = ("n", "possible", "guessed", "codes")
+
+    def __init__(self, n):
+        self.n = n
+        self.possible = np.packbits(np.ones(n, dtype=bool))
+        self.guessed = np.packbits(np.zeros(n, dtype=bool))
+        self.codes = []
+
+    def masks(self):
+        possible = np.unpackbits(self.possible, count=self.n).view(bool)
+        guessed = np.unpackbits(self.guessed, count=self.n).view(bool)
+        return possible, guessed
+
+    def record(self, engine, guess, code):
+        # keep only players that would have produced the same feedback
+        possible, guessed = self.masks()
+        alive = np.flatnonzero(possible)
+        possible[alive] = engine.rows([guess], alive)[0] == code
+        guessed[guess] = True
+        self.codes.append(int(code))
+        self.possible = np.packbits(possible)
+        self.guessed = np.packbits(guessed)
+
+    def candidates(self):
+        possible, guessed = self.masks()
+        return np.flatnonzero(possible & ~guessed)
+
+    def to_dict(self):
+        return {"n": self.n, "possible": self.possible.tobytes().hex(), "guessed": self.guessed.tobytes().hex(), "codes": list(self.codes)}
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls.__new__(cls)
+        state.n = data["n"]
+        state.possible = np.frombuffer(bytes.fromhex(data["possible"]), dtype=np.uint8).copy()
+        state.guessed = np.frombuffer(bytes.fromhex(data["guessed"]), dtype=np.uint8).copy()
+        state.codes = list(data["codes"])
+        return state
+
+def walk(tree, codes):
+    # next guess in a decision tree (see decision_tree.py) after the given
+    # feedback codes, None when the game left the tree
+    node = tree
+    for code in codes:
+        node = node[1].get(code)
+        if node is None:
+            return None
+    return node[0]
+
+def pick(mask, rng):
+    # uniform pick among the set bits of a boolean mask
+    return int(np.flatnonzero(mask)[rng.integers(np.count_nonzero(mask))])
+
+def bot_move(engine, state, secret, difficulty, rng, tree=None):
+    # Picks the bot's next guess and records its feedback in state. With a
+    # precomputed decision tree the noise-free bot just walks it.
+    possible, guessed = state.masks()
+    unguessed = ~guessed
+    if not unguessed.any():
+        return None
+    contam_percent = CONTAMINATION.get(difficulty, 25)
+    candidates = possible & unguessed
+    n_candidates = int(np.count_nonzero(candidates))
+
+    if contam_percent >= 100:
+        guess = pick(unguessed, rng)
+    else:
+        # difficulty is noise on top of the solver: with a share proportional
+        # to contam_percent the bot picks a false positive instead
+        guess = None
+        if contam_percent > 0:
+            false_positives = unguessed & ~possible
+            n_extra = min(max(1, int((contam_percent / 100) * n_candidates)), int(np.count_nonzero(false_positives)))
+            if n_extra and rng.random() < n_extra / (n_candidates + n_extra):
+                guess = pick(false_positives, rng)
+        if guess is None and tree is not None and contam_percent == 0:
+            guess = walk(tree, state.codes)
+            if guess is not None and guessed[guess]:
+                guess = None
+        if guess is None:
+            if n_candidates == 0:
+                guess = pick(unguessed, rng)
+            elif not guessed.any():
+                guess = opening_guess(engine, rng)
+            elif len(state.codes) == 1:
+                guess = second_guess(engine, int(np.flatnonzero(guessed)[0]), state.codes[0], np.flatnonzero(candidates), rng)
+            else:
+                guess = best_guess(engine, np.flatnonzero(candidates), rng)
+
+    state.record(engine, guess, engine.feedback(guess, secret))
+    return guess
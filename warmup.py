@@ -0,0 +1,73 @@
+from packages import logging, threading, time
+import metrics
+
+# ----------------------------
+# Startup warm-up
+# ----------------------------
+# One background thread per server process loads the player snapshot and
+# builds the shared per-dataset caches (player index, feedback engine,
+# Players List figures), then resolves the photos of the whole pool with
+# at most WARMUP_WORKERS lookups at a time, starting with the player the
+# Player Info page opens on and going down the listing (most valuable
+# first). User reruns find warm caches; one that needs a photo first still
+# resolves it itself. progress() reports how far it got. The thread has no
+# ScriptRunContext (st.cache_* work without one, and borrowing a visitor's
+# would send its cache spinners to that visitor's page), so Streamlit's
+# "missing ScriptRunContext" warning is filtered out for it.
+WARMUP_WORKERS = 2  # concurrent image lookups, the rest is left to user requests
+WARMUP_DELAY = 1.0  # seconds: let the first page render before competing for the GIL
+THREAD_NAME = "footdle-warmup"
+CONTEXT_LOGGERS = [
+    "streamlit.runtime.scriptrunner_utils.script_run_context",
+    "streamlit.runtime.scriptrunner.script_run_context",  # older Streamlit releases
+]
+
+_lock = threading.Lock()
+_thread = None
+_progress = {"stage": "idle", "done": 0, "total": 0, "started_at": None, "finished_at": None, "error": None}
+
+def progress():
+    with _lock:
+        return dict(_progress)
+
+def _update(**changes):
+    with _lock:
+        _progress.update(changes)
+
+def start(workers=WARMUP_WORKERS):
+    # once per process, from the first script run
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.Thread(target=_run, args=(workers,), daemon=True, name=THREAD_NAME)
+    for name in CONTEXT_LOGGERS:
+        logging.getLogger(name).addFilter(_from_other_threads)
+    _thread.start()
+
+def _from_other_threads(record):
+    return record.threadName != THREAD_NAME
+
+def _run(workers):
+    time.sleep(WARMUP_DELAY)
+    _update(stage="dataset", started_at=time.time())
+    try:
+        with metrics.timed("warmup", stage="dataset"):
+            from scrape import get_player_snapshot, image_resolver
+            from players import get_player_index
+            from footdle import get_feedback_engine
+            from playerinfo import overview_figures
+            df, version = get_player_snapshot()
+            players = get_player_index(df, version)
+            get_feedback_engine(df, version)
+            overview_figures(df, version)
+        names = [players.sorted_names[0], *df["Name"]]
+        _update(stage="images", total=len(set(names)))
+        with metrics.timed("warmup", stage="images"):
+            image_resolver().resolve_all(names, max_workers=workers, progress=lambda done, total: _update(done=done, total=total))
+        _update(stage="done")
+    except Exception as e:
+        metrics.count("warmup_errors")
+        _update(stage="failed", error=repr(e))
+    finally:
+        _update(finished_at=time.time())